@@ -1,37 +1,167 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, abort, Response, stream_with_context, has_request_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy import func, case, and_, or_, bindparam, select, event
 import os
+import csv
+import io
+import json
+import secrets
+import hashlib
+import mimetypes
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from werkzeug.utils import secure_filename
-
-from flask import send_from_directory
+from decimal import Decimal
+from collections import Counter
+
+from flask import send_from_directory, g
+from werkzeug.exceptions import HTTPException
+from werkzeug.security import safe_join
+from turf_search import TurfSearchIndex, SORTS
+from people_search import PeopleSearchIndex, decode_cursor
+from friend_graph import FriendGraph
+from chat_events import LocalBroker, ChatEvent, event_stream
+from presence import PresenceTracker
+from counters import CounterBuffer
+from availability import Schedule, OccupancyCache
+from cache import TTLCache
+from versions import VersionTracker, ResponseCache
+from logs import setup_logging
+from encoding import FastJSONProvider, setup_compression, JSON_MIMETYPE
+from credentials import CredentialService, CredentialsBusy
+from uids import UidAllocator
+from db_engine import engine_options, pool_status, primary_db, RoutingSession, REPLICA_BIND
+from images import ImagePipeline, VARIANTS, MAX_UPLOAD_BYTES, variant_name, parse_name
 
 # Configure Uploads
 # Move uploads outside 'backend' to prevent Flask reloader from restarting on file save
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
-
-print(f"Upload Folder Configured at: {UPLOAD_FOLDER}")
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 app = Flask(__name__)
+# JSON lines through a background queue, tagged with the request id (see logs.py)
+log = setup_logging(app)
+log.info('Upload folder configured', extra={'upload_folder': UPLOAD_FOLDER})
+# orjson-backed jsonify with MessagePack on request, gzip/brotli above a size (see encoding.py)
+app.json = FastJSONProvider(app, use_orjson=os.getenv('JSON_ENCODER', 'orjson') == 'orjson')
+setup_compression(app)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Leave room for the multipart form fields around the image itself
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 1024 * 1024
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# Resized, metadata-free variants are rendered off the request thread (see images.py)
+images = ImagePipeline(UPLOAD_FOLDER, workers=int(os.getenv('IMAGE_WORKERS', 2)))
+
+# '' serves bytes from Python; 'x-accel' (nginx) or 'x-sendfile' (Apache, lighttpd)
+# hands them to the front proxy once the file has been resolved here. For nginx,
+# map UPLOAD_ACCEL_PREFIX to the uploads folder with an `internal` location.
+UPLOAD_SEND_MODE = os.getenv('UPLOAD_SEND_MODE', '')
+UPLOAD_ACCEL_PREFIX = os.getenv('UPLOAD_ACCEL_PREFIX', '/_uploads/')
+app.config['USE_X_SENDFILE'] = UPLOAD_SEND_MODE == 'x-sendfile'
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+LEGACY_UPLOAD_MAX_AGE = 24 * 3600
+_legacy_etags = {}      # filename -> (mtime, size, etag)
+
+def upload_etag(filename, path):
+    """Strong ETag for an upload, or None if the file does not exist.
+
+    Pipeline names already are content hashes. Older timestamp-named uploads
+    are hashed once and remembered until their mtime or size changes.
+    """
+    if parse_name(filename):
+        return filename if os.path.isfile(path) else None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    cached = _legacy_etags.get(filename)
+    if cached and cached[:2] == (st.st_mtime, st.st_size):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    etag = digest.hexdigest()[:20]
+    _legacy_etags[filename] = (st.st_mtime, st.st_size, etag)
+    return etag
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    # A variant linked from a just-saved turf may still be rendering
+    images.wait(filename)
+    path = safe_join(app.config['UPLOAD_FOLDER'], filename)
+    etag = upload_etag(filename, path) if path else None
+    if etag is None:
+        abort(404)
+    immutable = parse_name(filename) is not None
+    max_age = IMMUTABLE_MAX_AGE if immutable else LEGACY_UPLOAD_MAX_AGE
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif UPLOAD_SEND_MODE == 'x-accel':
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = UPLOAD_ACCEL_PREFIX + filename
+    else:
+        # Range requests are handled here; X-Sendfile is added via USE_X_SENDFILE
+        response = send_from_directory(app.config['UPLOAD_FOLDER'], filename,
+                                       etag=False, conditional=True, max_age=max_age)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.immutable = immutable
+    return response
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def save_turf_image(file):
+    """Queue an uploaded turf photo; returns the image_url to store (card JPEG).
+
+    Raises ValueError if the file is not an acceptable image.
+    """
+    if not allowed_file(file.filename):
+        raise ValueError('Image must be JPEG, PNG, GIF or WebP')
+    key = images.submit(file.read())
+    return f"/uploads/{variant_name(key, 'card', 'jpg')}"
+
+def media_url(path):
+    """Absolute URL for a stored /uploads/ path.
+
+    PUBLIC_BASE_URL wins (e.g. behind a proxy or CDN); otherwise the host the
+    request came in on. Older rows stored absolute URLs and pass through.
+    """
+    if not path or not path.startswith('/'):
+        return path
+    return media_base() + path
+
+def media_base():
+    """Origin media_url() prefixes; it varies by request host unless PUBLIC_BASE_URL is set."""
+    base = os.getenv('PUBLIC_BASE_URL') or (request.host_url if has_request_context() else '')
+    return base.rstrip('/')
+
+def image_fields(image_url):
+    """image_url plus WebP/JPEG srcsets when the image came through the pipeline."""
+    parsed = parse_name(image_url.rsplit('/', 1)[-1]) if image_url else None
+    if parsed is None:
+        return {'image_url': image_url, 'image_srcset': None}
+    key = parsed[0]
+    return {
+        'image_url': media_url(image_url),
+        'image_srcset': {
+            ext: ', '.join(f"{media_url('/uploads/' + variant_name(key, variant, ext))} {width}w"
+                           for variant, width in VARIANTS)
+            for ext in ('webp', 'jpg')
+        }
+    }
+
 # Database Configuration
 DB_USER = os.getenv('DB_USER', 'root')
 DB_PASS = os.getenv('DB_PASSWORD', 'root')
@@ -40,8 +170,20 @@ DB_NAME = os.getenv('DB_NAME', 'turn_app')
 
 app.config['SQLALCHEMY_DATABASE_URI'] = f'mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pool sizing, recycle and pre-ping from DB_POOL_* (see db_engine.py)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+
+# Optional read replica: GET requests read from it unless marked @primary_db
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+if DB_REPLICA_HOST:
+    replica_user = os.getenv('DB_REPLICA_USER', DB_USER)
+    replica_pass = os.getenv('DB_REPLICA_PASSWORD', DB_PASS)
+    app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: {
+        'url': f'mysql+pymysql://{replica_user}:{replica_pass}@{DB_REPLICA_HOST}/{DB_NAME}',
+        **engine_options()
+    }}
 
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 
 # Models
 class User(db.Model):
@@ -52,7 +194,7 @@ class User(db.Model):
     role = db.Column(db.Enum('user', 'owner', 'admin'), default='user')
     name = db.Column(db.String(255))
     is_online = db.Column(db.Boolean, default=False)
-    uid = db.Column(db.String(6), unique=True)
+    uid = db.Column(db.String(12), unique=True)   # public code, see uids.py
     is_banned = db.Column(db.Boolean, default=False)
     upi_id = db.Column(db.String(100))   # Owner's UPI ID for receiving payments
     last_seen = db.Column(db.DateTime, default=datetime.utcnow)  # For real online detection
@@ -63,14 +205,17 @@ class Turf(db.Model):
     __tablename__ = 'turfs'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
-    sport_type = db.Column(db.String(50), default='Cricket')
-    city = db.Column(db.String(255), nullable=False)
+    sport_type = db.Column(db.String(50), default='Cricket', index=True)
+    city = db.Column(db.String(255), nullable=False, index=True)
     location = db.Column(db.Text, nullable=False)
     amenities = db.Column(db.Text)
     price = db.Column(db.Numeric(10, 2))
     image_url = db.Column(db.String(500))
     status = db.Column(db.Enum('pending', 'approved', 'rejected'), default='approved')
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    open_hour = db.Column(db.Integer, default=9)       # first slot starts at this hour
+    close_hour = db.Column(db.Integer, default=23)     # last slot ends at this hour
+    slot_minutes = db.Column(db.Integer, default=60)
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
@@ -78,10 +223,12 @@ class Booking(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     turf_id = db.Column(db.Integer, db.ForeignKey('turfs.id'))
     slot_id = db.Column(db.Integer)
-    game_id = db.Column(db.String(50))
+    game_id = db.Column(db.String(50), unique=True)   # short join code, see new_game_code()
     total_amount = db.Column(db.Numeric(10, 2))
     advance_amount = db.Column(db.Numeric(10, 2))   # 20% paid by organiser
     num_players = db.Column(db.Integer, default=1)  # total players splitting cost
+    amount_collected = db.Column(db.Numeric(10, 2), default=0)  # running sum of game_payments
+    slots_filled = db.Column(db.Integer, default=0)             # running count of game_payments
     status = db.Column(db.Enum('pending', 'confirmed', 'cancelled'), default='pending')
     type = db.Column(db.Enum('online', 'offline', 'split'), default='online')
     booking_date = db.Column(db.Date)
@@ -90,6 +237,39 @@ class Booking(db.Model):
 
     turf = db.relationship('Turf')
 
+    __table_args__ = (
+        # Owner dashboards and slot lookups filter by turf and date window
+        db.Index('ix_bookings_turf_slot', 'turf_id', 'booking_date', 'start_time'),
+    )
+
+class SlotLock(db.Model):
+    """One row per taken slot; its primary key is what rules out double booking.
+
+    expires_at is set while a user holds the slot during checkout and cleared
+    once the booking is confirmed (booking_id is filled in at that point).
+    """
+    __tablename__ = 'slot_locks'
+    turf_id = db.Column(db.Integer, db.ForeignKey('turfs.id'), primary_key=True)
+    booking_date = db.Column(db.Date, primary_key=True)
+    start_time = db.Column(db.Time, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+class UidSequence(db.Model):
+    """Single row: next unissued position of the UID permutation (see uids.py)."""
+    __tablename__ = 'uid_sequence'
+    id = db.Column(db.Integer, primary_key=True)
+    width = db.Column(db.Integer, nullable=False)
+    next_value = db.Column(db.BigInteger, nullable=False, default=0)
+    secret = db.Column(db.String(64), nullable=False)   # permutation key; never change it
+
+class LegacyGameId(db.Model):
+    """Old 'username-09AM' game ids, mapped to the booking their links resolved to."""
+    __tablename__ = 'legacy_game_ids'
+    legacy_id = db.Column(db.String(50), primary_key=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=False)
+
 class GamePayment(db.Model):
     """Tracks each friend's share payment for a split booking."""
     __tablename__ = 'game_payments'
@@ -101,12 +281,19 @@ class GamePayment(db.Model):
     upi_ref = db.Column(db.String(100))   # UPI transaction reference
     paid_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (db.UniqueConstraint('booking_id', 'player_name', name='ux_game_payments_player'),)
+
 class Friend(db.Model):
     __tablename__ = 'friends'
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
     friend_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
     status = db.Column(db.Enum('pending', 'accepted'), default='pending')
 
+    __table_args__ = (
+        # The primary key serves lookups by user_id; this serves the receiver side
+        db.Index('ix_friends_friend', 'friend_id', 'user_id'),
+    )
+
 class Message(db.Model):
     __tablename__ = 'messages'
     id = db.Column(db.Integer, primary_key=True)
@@ -117,6 +304,39 @@ class Message(db.Model):
     is_read = db.Column(db.Boolean, default=False)   # Has the receiver read this?
     read_at = db.Column(db.DateTime, nullable=True)  # When they read it
 
+    # Serves keyset paging over one direction of a conversation
+    __table_args__ = (db.Index('ix_messages_pair', 'sender_id', 'receiver_id', 'id'),)
+
+class Conversation(db.Model):
+    """One row per chat pair (user_low_id < user_high_id), updated with every message."""
+    __tablename__ = 'conversations'
+    user_low_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    user_high_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    last_message_id = db.Column(db.Integer, db.ForeignKey('messages.id'))
+    last_timestamp = db.Column(db.DateTime)
+    unread_low = db.Column(db.Integer, nullable=False, default=0)    # unread by user_low_id
+    unread_high = db.Column(db.Integer, nullable=False, default=0)   # unread by user_high_id
+
+class StatCounter(db.Model):
+    """Dashboard headline numbers, bumped by the write routes (see bump_stat)."""
+    __tablename__ = 'stat_counters'
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+class ResourceVersion(db.Model):
+    """Version per cacheable resource, bumped by its writers (see versions.py)."""
+    __tablename__ = 'resource_versions'
+    name = db.Column(db.String(64), primary_key=True)   # 'announcements', 'turf:<id>'
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+class DailyCityStats(db.Model):
+    """Bookings and revenue per day (booking creation date, UTC) and turf city."""
+    __tablename__ = 'daily_city_stats'
+    day = db.Column(db.Date, primary_key=True)
+    city = db.Column(db.String(255), primary_key=True)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
 class Announcement(db.Model):
     __tablename__ = 'announcements'
     id = db.Column(db.Integer, primary_key=True)
@@ -133,13 +353,389 @@ class Rating(db.Model):
     review = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class TurfRatingStats(db.Model):
+    """Running rating totals per turf, updated alongside every new Rating."""
+    __tablename__ = 'turf_rating_stats'
+    turf_id = db.Column(db.Integer, db.ForeignKey('turfs.id'), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+
+
+def serialize_turf(t, rating_count=0, rating_sum=0):
+    """Public turf payload; rating figures come from turf_rating_stats."""
+    avg = (rating_sum / rating_count) if rating_count else None
+    return {
+        'id': t.id,
+        'name': t.name,
+        'sport_type': t.sport_type,
+        'city': t.city,
+        'location': t.location,
+        'amenities': t.amenities.split(',') if t.amenities else [],
+        'price': float(t.price) if t.price else 0,
+        **image_fields(t.image_url),
+        'avg_rating': round(float(avg), 1) if avg else None,
+        'open_hour': t.open_hour,
+        'close_hour': t.close_hour,
+        'slot_minutes': t.slot_minutes
+    }
+
+def turf_listing_query():
+    """Turfs joined with their rating stats, so a listing is a single query."""
+    return db.session.query(
+        Turf, TurfRatingStats.rating_count, TurfRatingStats.rating_sum
+    ).outerjoin(TurfRatingStats, TurfRatingStats.turf_id == Turf.id)
+
+def upsert(model, values, update):
+    """INSERT ... ON DUPLICATE KEY UPDATE for counter and summary rows.
+
+    One statement, so two requests creating the same row at once both land
+    instead of one failing the primary key. update may be a dict, or a list
+    of (column, value) pairs when assignment order matters.
+    """
+    stmt = mysql_insert(model).values(**values)
+    return db.session.execute(stmt.on_duplicate_key_update(update))
+
+STAT_NAMES = ('users', 'owners', 'turfs', 'pending_turfs', 'bookings', 'revenue')
+
+def bump_stat(name, delta=1):
+    """Queue a dashboard counter change; applied after the caller commits (see counters.py)."""
+    if not delta:
+        return
+    deltas = db.session.info.setdefault('stat_deltas', Counter())
+    deltas[('stat', name)] += Decimal(str(delta))
+
+def bump_version(name):
+    """Advance a resource's version inside the caller's transaction."""
+    upsert(ResourceVersion, {'name': name, 'version': 1}, {'version': ResourceVersion.version + 1})
+    db.session.info.setdefault('bumped_versions', set()).add(name)
+
+@event.listens_for(db.session, 'after_commit')
+def forget_bumped_versions(session):
+    # This worker sees its own writes at once; others within VERSION_TTL
+    names = session.info.pop('bumped_versions', None)
+    if names:
+        version_tracker.invalidate(names)
+        response_cache.discard(names)
+
+@event.listens_for(db.session, 'after_rollback')
+def drop_bumped_versions(session):
+    session.info.pop('bumped_versions', None)
+
+@event.listens_for(db.session, 'after_commit')
+def queue_stat_deltas(session):
+    deltas = session.info.pop('stat_deltas', None)
+    if deltas:
+        stat_buffer.merge(deltas)
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def drop_stat_deltas(session, previous_transaction):
+    # Soft: also fires when nothing reached the database yet. Savepoint
+    # rollbacks leave the outer transaction (and its deltas) alive.
+    if not session.in_transaction():
+        session.info.pop('stat_deltas', None)
+
+version_tracker = VersionTracker(
+    lambda name: db.session.query(ResourceVersion.version).filter_by(name=name).scalar() or 0,
+    ttl=int(os.getenv('VERSION_TTL', 2)))
+response_cache = ResponseCache()
+
+def versioned_json(name, build):
+    """JSON response for a versioned resource: 304 on a matching ETag, else cached bytes."""
+    version = version_tracker.get(name)
+    mimetype = app.json.negotiate()
+    # Bodies embed absolute media URLs, so each origin gets its own copy and tag
+    base = media_base()
+    variant = (mimetype, base)
+    etag = f"{name}-v{version}-{hashlib.blake2b(base.encode(), digest_size=4).hexdigest()}"
+    if mimetype != JSON_MIMETYPE:
+        etag += '-msgpack'
+    compression = app.extensions.get('compression')
+    # Weak comparison: compressed responses carry the ETag as W/"..."
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+    else:
+        body = response_cache.get(name, version, variant)
+        if body is None:
+            body = app.json.encode(build(), mimetype)
+            response_cache.put(name, version, body, variant)
+        # The compressed bytes are cached next to the raw ones, so a hot
+        # resource is compressed once per version and coding, not per request
+        coding = compression.negotiate(len(body)) if compression else None
+        if coding:
+            compressed = response_cache.get(name, version, variant + (coding,))
+            if compressed is None:
+                compressed = compression.compress(body, coding)
+                response_cache.put(name, version, compressed, variant + (coding,))
+            body = compressed
+        response = Response(body, mimetype=mimetype)
+        if coding:
+            response.headers['Content-Encoding'] = coding
+        response.set_etag(etag, weak=bool(coding))
+    response.vary.add('Accept')
+    if compression:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True   # always revalidate; 304s are cheap
+    return response
+
+def record_booking_stats(city, amount):
+    bump_stat('bookings')
+    bump_stat('revenue', amount)
+    day = datetime.utcnow().date()
+    deltas = db.session.info.setdefault('stat_deltas', Counter())
+    deltas[('day', day, city, 'bookings')] += 1
+    deltas[('day', day, city, 'revenue')] += Decimal(str(amount))
+
+def flush_stat_deltas(deltas):
+    """Apply summed counter deltas in one short transaction of upserts."""
+    stats, daily = {}, {}
+    for key, delta in deltas.items():
+        if key[0] == 'stat':
+            stats[key[1]] = delta
+        else:
+            daily.setdefault(key[1:3], {'bookings': 0, 'revenue': 0})[key[3]] = delta
+    with app.app_context():
+        # Fixed key order, so flushes from several workers cannot deadlock
+        for name, delta in sorted(stats.items()):
+            upsert(StatCounter, {'name': name, 'value': delta}, {'value': StatCounter.value + delta})
+        for (day, city), values in sorted(daily.items()):
+            upsert(DailyCityStats, {'day': day, 'city': city, **values}, {
+                'bookings': DailyCityStats.bookings + values['bookings'],
+                'revenue': DailyCityStats.revenue + values['revenue'],
+            })
+        db.session.commit()
+
+# Counter increments are summed in memory and written every few seconds, so
+# signups and bookings never wait on the shared counter rows
+stat_buffer = CounterBuffer(flush_stat_deltas, flush_interval=int(os.getenv('STATS_FLUSH_SECONDS', 5)))
+
+def rebuild_admin_stats():
+    """Recompute counters and the daily series from the raw tables.
+
+    Corrects drift from rows written outside the API (seed scripts, manual
+    SQL). Run by POST /api/admin/stats/rebuild; migrate_admin_stats.py does
+    the same in SQL.
+    """
+    # Increments not yet flushed are already counted by the recompute
+    stat_buffer.discard()
+    values = {
+        'users': User.query.filter_by(role='user').count(),
+        'owners': User.query.filter_by(role='owner').count(),
+        'turfs': Turf.query.count(),
+        'pending_turfs': Turf.query.filter_by(status='pending').count(),
+        'bookings': Booking.query.count(),
+        'revenue': db.session.query(func.coalesce(func.sum(Booking.total_amount), 0)).scalar(),
+    }
+    StatCounter.query.delete()
+    db.session.add_all([StatCounter(name=k, value=v) for k, v in values.items()])
+
+    day = func.date(Booking.created_at)
+    rows = db.session.query(
+        day, Turf.city, func.count(Booking.id), func.coalesce(func.sum(Booking.total_amount), 0)
+    ).join(Turf, Turf.id == Booking.turf_id).filter(Booking.created_at.isnot(None)).group_by(day, Turf.city).all()
+    DailyCityStats.query.delete()
+    db.session.add_all([
+        DailyCityStats(day=d if not isinstance(d, str) else datetime.strptime(d, '%Y-%m-%d').date(),
+                       city=city, bookings=n, revenue=total)
+        for d, city, n, total in rows
+    ])
+    db.session.commit()
+    stats_cache.clear()
+
+stats_cache = TTLCache(ttl=int(os.getenv('ADMIN_STATS_TTL', 30)))
+
+# In-process search index over turfs (see turf_search.py)
+turf_index = TurfSearchIndex(max_age=int(os.getenv('TURF_INDEX_MAX_AGE', 300)))
+
+def get_turf_index():
+    """Return the search index, (re)loading it from the turfs table when stale."""
+    if turf_index.is_stale():
+        turf_index.rebuild(db.session.query(
+            Turf.id, Turf.name, Turf.city, Turf.location,
+            Turf.sport_type, Turf.price, Turf.amenities
+        ).all())
+    return turf_index
+
+def load_turfs(ids):
+    """Serialized turfs for the given ids, in the same order, from one query."""
+    if not ids:
+        return []
+    rows = {t.id: (t, count, total) for t, count, total in turf_listing_query().filter(Turf.id.in_(ids)).all()}
+    return [serialize_turf(*rows[i]) for i in ids if i in rows]
+
+# Per turf-day occupancy bitmaps (see availability.py)
+occupancy = OccupancyCache(ttl=int(os.getenv('SLOT_CACHE_TTL', 60)))
+
+def taken_start_times(turf_ids, dates):
+    """(turf_id, date, start_time) of booked or currently held slots, in one query."""
+    return db.session.query(SlotLock.turf_id, SlotLock.booking_date, SlotLock.start_time).filter(
+        SlotLock.turf_id.in_(turf_ids),
+        SlotLock.booking_date.in_(dates),
+        (SlotLock.expires_at.is_(None)) | (SlotLock.expires_at > datetime.now())
+    ).all()
+
+# Crockford base32: no I, L, O or U, so codes survive being read aloud or retyped
+GAME_CODE_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+def new_game_code():
+    """8-character join code from 40 random bits; the unique index catches repeats."""
+    bits = secrets.randbits(40)
+    return ''.join(GAME_CODE_ALPHABET[(bits >> shift) & 31] for shift in range(35, -1, -5))
+
+def find_game(game_id, query=None):
+    """First row of query (default: Booking) for a join code.
+
+    One indexed lookup, plus one through legacy_game_ids for pre-code links.
+    """
+    query = query if query is not None else Booking.query
+    row = query.filter(Booking.game_id == game_id).first()
+    if row is None:
+        legacy = LegacyGameId.query.get(game_id)
+        row = query.filter(Booking.id == legacy.booking_id).first() if legacy else None
+    return row
+
+def record_game_payment(payment):
+    """Insert a payment and bump its booking's running totals in one transaction.
+
+    Returns False if this player already paid (unique booking_id, player_name).
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(payment)
+    except IntegrityError:
+        return False
+    Booking.query.filter_by(id=payment.booking_id).update({
+        Booking.amount_collected: func.coalesce(Booking.amount_collected, 0) + payment.amount_paid,
+        Booking.slots_filled: func.coalesce(Booking.slots_filled, 0) + 1
+    }, synchronize_session=False)
+    return True
+
+SLOT_HOLD_SECONDS = int(os.getenv('SLOT_HOLD_SECONDS', 300))
+
+def slot_claim(turf_id, day, start, user_id, booking_id, expires_at, now):
+    """INSERT ... ON DUPLICATE KEY UPDATE claiming a slot_locks row (see acquire_slot)."""
+    # MySQL applies the assignments left to right, each seeing the ones before
+    # it. user_id goes first, on the real takeover test (an expired hold, or
+    # the caller's own). After it, "a hold now owned by the caller" is true
+    # exactly when the takeover happened, which gates the other two columns.
+    takeover = and_(SlotLock.expires_at.isnot(None),
+                    or_(SlotLock.expires_at < now, SlotLock.user_id == user_id))
+    taken = and_(SlotLock.expires_at.isnot(None), SlotLock.user_id == user_id)
+    return mysql_insert(SlotLock).values(
+        turf_id=turf_id, booking_date=day, start_time=start,
+        user_id=user_id, booking_id=booking_id, expires_at=expires_at
+    ).on_duplicate_key_update([
+        ('user_id', case((takeover, user_id), else_=SlotLock.user_id)),
+        ('booking_id', case((taken, booking_id), else_=SlotLock.booking_id)),
+        ('expires_at', case((taken, expires_at), else_=SlotLock.expires_at)),
+    ])
+
+def acquire_slot(turf_id, day, start, user_id, booking_id=None, hold_seconds=None):
+    """Claim a slot inside the current transaction; False if someone else has it.
+
+    With hold_seconds the claim is a temporary hold, otherwise it is final.
+    Expired holds and the caller's own hold can be taken over.
+    """
+    user_id = int(user_id)
+    now = datetime.now().replace(microsecond=0)   # DATETIME has whole seconds
+    expires_at = now + timedelta(seconds=hold_seconds) if hold_seconds else None
+    # One statement that takes the row lock straight away: no UPDATE on a
+    # missing key (a gap lock) followed by an INSERT, which deadlocked
+    db.session.execute(slot_claim(turf_id, day, start, user_id, booking_id, expires_at, now))
+    # The row is ours to read now; it holds our values only if the claim landed
+    row = db.session.query(SlotLock.user_id, SlotLock.booking_id, SlotLock.expires_at).filter_by(
+        turf_id=turf_id, booking_date=day, start_time=start).with_for_update().one()
+    return tuple(row) == (user_id, booking_id, expires_at)
+
+def is_lock_conflict(error):
+    """True for MySQL deadlock (1213) or lock wait timeout (1205): the slot is contended."""
+    return isinstance(error, OperationalError) and getattr(error.orig, 'args', (None,))[0] in (1205, 1213)
+
+def parse_clock(value):
+    """Time from 'H:MM' or 'H:MM:SS' (the owner dashboard sends seconds)."""
+    try:
+        return datetime.strptime(value or '', '%H:%M:%S').time()
+    except ValueError:
+        return datetime.strptime(value or '', '%H:%M').time()
+
+def parse_slot(data):
+    """(turf, date, start time) from a request body; raises ValueError if invalid."""
+    day = datetime.strptime(data.get('date') or '', '%Y-%m-%d').date()
+    start = parse_clock(data.get('start_time'))
+    turf = Turf.query.get(data.get('turf_id'))
+    if not turf:
+        raise ValueError('Turf not found')
+    if Schedule.for_turf(turf).index_of(start) is None:
+        raise ValueError('start_time is not a bookable slot for this turf')
+    return turf, day, start
+
+SCHEDULE_FIELDS = ('open_hour', 'close_hour', 'slot_minutes')
+
+def has_field(data, key):
+    """True if the body carries a value for key; 0 counts, an empty form field does not."""
+    return data.get(key) is not None and data.get(key) != ''
+
+def parse_schedule(data, default=None):
+    """Opening hours / slot length from a request body; raises ValueError if invalid."""
+    default = default or Schedule(9, 23, 60)
+    schedule = Schedule(*(
+        int(data[k]) if has_field(data, k) else getattr(default, k)
+        for k in SCHEDULE_FIELDS
+    ))
+    if not (0 <= schedule.open_hour < schedule.close_hour <= 24):
+        raise ValueError('open_hour must be before close_hour, both within 0-24')
+    if schedule.slot_minutes not in (30, 45, 60, 90, 120):
+        raise ValueError('slot_minutes must be one of 30, 45, 60, 90, 120')
+    return schedule
+
 
 # ROUTES
 
 # ... (Auth routes remain same, see previous steps) ...
-from werkzeug.security import check_password_hash
-
 # ... (Auth routes remain same, see previous steps) ...
+# Hashing runs on its own bounded pool (see credentials.py)
+credentials = CredentialService(
+    method=os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+    workers=int(os.getenv('PASSWORD_HASH_WORKERS', 2)),
+    max_queue=int(os.getenv('PASSWORD_HASH_QUEUE', 32)),
+)
+
+UID_MAX_WIDTH = 12   # users.uid is VARCHAR(12)
+
+def reserve_uid_block(count):
+    """Claim up to count sequence positions in their own short transaction.
+
+    Returns (key, width, start, granted). migrate_uid_sequence.py creates the
+    sequence; failing that, the first call does, at width 6, or 7 when older
+    random 6-character codes already exist.
+    Exhausting a width moves the sequence to the next one.
+    """
+    table = UidSequence.__table__
+    with db.engine.begin() as conn:
+        # Plain read first: a locking read of a missing row takes a gap lock,
+        # and two workers holding it would deadlock on the INSERT below
+        if conn.execute(select(table.c.id).where(table.c.id == 1)).first() is None:
+            legacy = conn.execute(select(func.count()).select_from(User.__table__)
+                                  .where(func.length(User.uid) == 6)).scalar()
+            # No-op on a duplicate, so concurrent first calls both go through
+            conn.execute(mysql_insert(table).values(
+                id=1, width=7 if legacy else 6, next_value=0, secret=secrets.token_hex(32)
+            ).on_duplicate_key_update(id=table.c.id))
+        row = conn.execute(select(table).where(table.c.id == 1).with_for_update()).one()
+        width, start = row.width, row.next_value
+        if start >= 10 ** width:
+            width, start = width + 1, 0
+            if width > UID_MAX_WIDTH:
+                raise RuntimeError('UID space exhausted')
+        granted = min(count, 10 ** width - start)
+        conn.execute(table.update().where(table.c.id == 1).values(width=width, next_value=start + granted))
+    return bytes.fromhex(row.secret), width, start, granted
+
+uid_allocator = UidAllocator(reserve_uid_block, block_size=int(os.getenv('UID_BLOCK_SIZE', 100)))
+
+def login_busy():
+    return jsonify({'error': 'Too many sign-in attempts right now, please retry shortly'}), 503, {'Retry-After': '2'}
+
 @app.route('/api/login', methods=['POST'])
 def login():
     data = request.json
@@ -157,13 +753,13 @@ def login():
     if user.is_banned:
         return jsonify({'error': 'Account suspended. Contact support.'}), 403
 
-    # Check password (supports both legacy plain text and new hashes)
-    password_valid = False
-    if user.password_hash.startswith('scrypt:') or user.password_hash.startswith('pbkdf2:'):
-        password_valid = check_password_hash(user.password_hash, password)
-    else:
-        # Fallback for old plain text passwords (optional, but good for transition)
-        password_valid = (user.password_hash == password)
+    try:
+        password_valid = credentials.verify(user.password_hash, password)
+        if password_valid and credentials.needs_rehash(user.password_hash):
+            # Upgrade plaintext or older-cost rows while we have the password
+            user.password_hash = credentials.hash(password)
+    except CredentialsBusy:
+        return login_busy()
 
     if password_valid:
         user.is_online = True
@@ -188,20 +784,31 @@ def logout():
     user_id = data.get('user_id')
     if user_id:
         user = User.query.get(user_id)
+        presence.forget(int(user_id))
         if user:
             user.is_online = False
             user.last_seen = datetime.now()
             db.session.commit()
     return jsonify({'message': 'Logged out'})
 
+def flush_presence(items):
+    """Bulk-write coalesced heartbeats: one executemany UPDATE per batch."""
+    users = User.__table__
+    with app.app_context():
+        db.session.execute(
+            users.update().where(users.c.id == bindparam('b_id'))
+            .values(last_seen=bindparam('b_seen'), is_online=True),
+            [{'b_id': user_id, 'b_seen': seen} for user_id, seen in items]
+        )
+        db.session.commit()
+
+# Heartbeats are kept in memory and flushed in batches (see presence.py)
+presence = PresenceTracker(flush_presence, flush_interval=int(os.getenv('PRESENCE_FLUSH_SECONDS', 30)))
+
 @app.route('/api/users/<int:user_id>/heartbeat', methods=['POST'])
 def heartbeat(user_id):
     """Called every 30s by the frontend to mark user as online."""
-    user = User.query.get(user_id)
-    if user:
-        user.is_online = True
-        user.last_seen = datetime.now()
-        db.session.commit()
+    presence.touch(user_id)
     return jsonify({'ok': True})
 
 @app.route('/api/signup', methods=['POST'])
@@ -212,25 +819,25 @@ def signup():
     name = data.get('name')
     if not email or not password: return jsonify({'error': 'Missing data'}), 400
     
-    # Generate UID
-    import random, string
-    while True:
-        uid = ''.join(random.choices(string.digits, k=6))
-        if not User.query.filter_by(uid=uid).first():
-            break
-            
-    new_user = User(username=email, password_hash=password, role='user', name=name, uid=uid)
+    uid = uid_allocator.next_uid()
+    try:
+        password_hash = credentials.hash(password)
+    except CredentialsBusy:
+        return login_busy()
+    new_user = User(username=email, password_hash=password_hash, role='user', name=name, uid=uid)
     try:
         db.session.add(new_user)
+        bump_stat('users')
         db.session.commit()
+        people_index.upsert(new_user.id, new_user.name, new_user.uid)
         return jsonify({'message': 'User created', 'user': {'username': email, 'role': 'user'}}), 201
     except IntegrityError as e:
         db.session.rollback()
-        print(f"Signup IntegrityError: {e}")
+        log.info('Signup rejected, user exists', extra={'username': email})
         return jsonify({'error': 'User already exists'}), 409
     except Exception as e:
         db.session.rollback()
-        print(f"Signup Error: {e}")
+        log.exception('Signup failed')
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/admin/add-owner', methods=['POST'])
@@ -239,9 +846,16 @@ def add_owner():
     username = data.get('username')
     password = data.get('password')
     name = data.get('name')
-    new_owner = User(username=username, password_hash=password, role='owner', name=name)
+    if not username or not password:
+        return jsonify({'error': 'Missing data'}), 400
+    try:
+        password_hash = credentials.hash(password)
+    except CredentialsBusy:
+        return login_busy()
+    new_owner = User(username=username, password_hash=password_hash, role='owner', name=name)
     try:
         db.session.add(new_owner)
+        bump_stat('owners')
         db.session.commit()
         return jsonify({'message': 'Owner added'}), 201
     except IntegrityError:
@@ -257,8 +871,8 @@ def get_owners():
             'name': u.name,
             'created_at': u.created_at.strftime('%Y-%m-%d') if hasattr(u, 'created_at') and u.created_at else ''
         } for u in owners])
-    except Exception as e:
-        print(f"Error getting owners: {e}")
+    except Exception:
+        log.exception('Listing owners failed')
         return jsonify([])
 @app.route('/api/admin/owners/<int:id>', methods=['DELETE'])
 def delete_owner(id):
@@ -266,46 +880,154 @@ def delete_owner(id):
     if owner.role != 'owner':
         return jsonify({'error': 'User is not an owner'}), 400
     db.session.delete(owner)
+    bump_stat('owners', -1)
     db.session.commit()
     return jsonify({'message': 'Owner deleted'})
 
+@app.route('/api/admin/db/pool', methods=['GET'])
+def get_db_pool_status():
+    """Connection pool usage and checkout wait times per engine (this worker only)."""
+    return jsonify({
+        name or 'primary': pool_status(engine) for name, engine in db.engines.items()
+    })
+
 @app.route('/api/admin/stats', methods=['GET'])
 def get_admin_stats():
     try:
-        total_users = User.query.filter_by(role='user').count()
-        total_owners = User.query.filter_by(role='owner').count()
-        total_turfs = Turf.query.count()
-        total_bookings = Booking.query.count()
-        pending_turfs = Turf.query.filter_by(status='pending').count()
-        
-        # Revenue (basic calc)
-        revenue = db.session.query(func.sum(Booking.total_amount)).scalar()
-        if revenue is None:
-            revenue = 0
-            
-        return jsonify({
-            'users': total_users,
-            'owners': total_owners,
-            'turfs': total_turfs,
-            'bookings': total_bookings,
-            'pending_turfs': pending_turfs,
-            'revenue': float(revenue)
-        })
+        def load():
+            values = dict(db.session.query(StatCounter.name, StatCounter.value).all())
+            stats = {name: int(values.get(name) or 0) for name in STAT_NAMES if name != 'revenue'}
+            stats['revenue'] = float(values.get('revenue') or 0)
+            return stats
+        return jsonify(stats_cache.get_or_set('totals', load))
     except Exception as e:
-        print(f"Error in get_admin_stats: {e}")
+        log.exception('Loading admin stats failed')
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/admin/users', methods=['GET'])
-def get_all_users():
-    users = User.query.filter(User.role != 'admin').all()
-    return jsonify([{
+@app.route('/api/admin/stats/series', methods=['GET'])
+def get_admin_stats_series():
+    """Daily bookings and revenue per city for the last ?days= days (default 30)."""
+    days = min(max(request.args.get('days', 30, type=int), 1), 366)
+    city = request.args.get('city')
+
+    def load():
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        query = DailyCityStats.query.filter(DailyCityStats.day >= since)
+        if city:
+            query = query.filter(DailyCityStats.city == city)
+        return [{
+            'date': str(r.day),
+            'city': r.city,
+            'bookings': r.bookings,
+            'revenue': float(r.revenue)
+        } for r in query.order_by(DailyCityStats.day, DailyCityStats.city).all()]
+    return jsonify(stats_cache.get_or_set(('series', days, city), load))
+
+@app.route('/api/admin/stats/rebuild', methods=['POST'])
+def rebuild_stats():
+    rebuild_admin_stats()
+    return jsonify({'message': 'Stats rebuilt'})
+
+ADMIN_USER_COLUMNS = ('id', 'username', 'name', 'role', 'is_banned', 'created_at')
+ADMIN_TURF_COLUMNS = ('id', 'name', 'city', 'owner_id', 'status', 'price')
+EXPORT_CHUNK_ROWS = 1000
+
+def parse_bool(value):
+    return None if value in (None, '') else value.lower() in ('1', 'true', 'yes')
+
+def admin_user_query():
+    """Column-only select of non-admin users, filtered by ?role= and ?banned=."""
+    query = db.session.query(User.id, User.username, User.name, User.role, User.is_banned, User.created_at)
+    query = query.filter(User.role != 'admin')
+    if request.args.get('role'):
+        query = query.filter(User.role == request.args['role'])
+    banned = parse_bool(request.args.get('banned'))
+    if banned is not None:
+        query = query.filter(User.is_banned == banned)
+    return query
+
+def admin_turf_query():
+    """Column-only select of turfs, filtered by ?city= and ?status=."""
+    query = db.session.query(Turf.id, Turf.name, Turf.city, Turf.owner_id, Turf.status, Turf.price)
+    if request.args.get('city'):
+        query = query.filter(Turf.city == request.args['city'])
+    if request.args.get('status'):
+        query = query.filter(Turf.status == request.args['status'])
+    return query
+
+def serialize_admin_user(u):
+    return {
         'id': u.id,
         'username': u.username,
         'name': u.name,
         'role': u.role,
-        'is_banned': u.is_banned,
-        'created_at': u.created_at.strftime('%Y-%m-%d') if hasattr(u, 'created_at') else ''
-    } for u in users])
+        'is_banned': bool(u.is_banned),
+        'created_at': u.created_at.strftime('%Y-%m-%d') if u.created_at else ''
+    }
+
+def serialize_admin_turf(t):
+    return {
+        'id': t.id,
+        'name': t.name,
+        'city': t.city,
+        'owner_id': t.owner_id,
+        'status': t.status,
+        'price': float(t.price) if t.price else 0
+    }
+
+def keyset_page(query, id_column, serialize):
+    """One page ordered by id: ?after_id= cursor, ?limit= (max 500)."""
+    after_id = request.args.get('after_id', type=int)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    if after_id:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    items = [serialize(r) for r in rows[:limit]]
+    return jsonify({
+        'items': items,
+        'next_after_id': items[-1]['id'] if len(rows) > limit else None
+    })
+
+def export_rows(query, columns, serialize, filename):
+    """Stream a query as NDJSON (default) or CSV (?format=csv) with flat memory.
+
+    Rows come from a server-side cursor in EXPORT_CHUNK_ROWS batches and are
+    written out one chunk at a time.
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    rows = query.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_ROWS)
+
+    def generate():
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=columns) if fmt == 'csv' else None
+        if writer:
+            writer.writeheader()
+        for count, row in enumerate(rows, 1):
+            item = serialize(row)
+            if writer:
+                writer.writerow(item)
+            else:
+                buf.write(json.dumps(item) + '\n')
+            if count % EXPORT_CHUNK_ROWS == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={filename}.{fmt}'
+    })
+
+@app.route('/api/admin/users', methods=['GET'])
+def get_all_users():
+    return keyset_page(admin_user_query(), User.id, serialize_admin_user)
+
+@app.route('/api/admin/users/export', methods=['GET'])
+def export_users():
+    return export_rows(admin_user_query().order_by(User.id), ADMIN_USER_COLUMNS, serialize_admin_user, 'users')
 
 @app.route('/api/admin/users/<int:id>/ban', methods=['POST'])
 def toggle_ban_user(id):
@@ -316,19 +1038,17 @@ def toggle_ban_user(id):
 
 @app.route('/api/admin/turfs', methods=['GET'])
 def get_all_turfs_admin():
-    turfs = Turf.query.all()
-    return jsonify([{
-        'id': t.id,
-        'name': t.name,
-        'city': t.city,
-        'owner_id': t.owner_id,
-        'status': t.status,
-        'price': float(t.price) if t.price else 0
-    } for t in turfs])
+    return keyset_page(admin_turf_query(), Turf.id, serialize_admin_turf)
+
+@app.route('/api/admin/turfs/export', methods=['GET'])
+def export_turfs():
+    return export_rows(admin_turf_query().order_by(Turf.id), ADMIN_TURF_COLUMNS, serialize_admin_turf, 'turfs')
 
 @app.route('/api/admin/turfs/<int:id>/approve', methods=['POST'])
 def approve_turf(id):
     turf = Turf.query.get_or_404(id)
+    if turf.status == 'pending':
+        bump_stat('pending_turfs', -1)
     turf.status = 'approved'
     db.session.commit()
     return jsonify({'message': 'Turf approved'})
@@ -342,44 +1062,113 @@ def send_announcement():
     # Store in DB
     ann = Announcement(content=content)
     db.session.add(ann)
+    bump_version('announcements')
     db.session.commit()
     
     return jsonify({'message': 'Announcement broadcasted'})
 
 @app.route('/api/announcements', methods=['GET'])
 def get_announcements():
-    anns = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
-    return jsonify([{
-        'id': a.id,
-        'content': a.content,
-        'created_at': a.created_at.strftime('%Y-%m-%d %H:%M')
-    } for a in anns])
+    def build():
+        anns = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
+        return [{
+            'id': a.id,
+            'content': a.content,
+            'created_at': a.created_at.strftime('%Y-%m-%d %H:%M')
+        } for a in anns]
+    return versioned_json('announcements', build)
 @app.route('/api/owner/bookings', methods=['GET'])
 def get_owner_bookings():
-    # In a real app, we'd filter by the current logged-in owner's ID
-    # For now, we'll fetch all bookings for turfs owned by this user (passed via query param or auth token)
-    user_id = request.args.get('user_id')
+    """Bookings across an owner's turfs, newest day first (?order=asc: soonest first).
+
+    ?from=/?to= (YYYY-MM-DD, inclusive) and ?turf_id= narrow the window.
+    Rows come a page at a time (?limit=, max 500) with next_cursor to pass
+    back as ?cursor= (with the same ?order=); ?summary=day returns per-day
+    counts and revenue instead.
+    """
+    user_id = request.args.get('user_id', type=int)
     if not user_id:
-        return jsonify([])
-    
-    # Find turfs owned by this user
-    my_turfs = Turf.query.filter_by(owner_id=user_id).all()
-    turf_ids = [t.id for t in my_turfs]
-    
-    if not turf_ids:
-        return jsonify([])
+        return jsonify({'error': 'user_id is required'}), 400
+    try:
+        date_from, date_to = (
+            datetime.strptime(request.args[k], '%Y-%m-%d').date() if request.args.get(k) else None
+            for k in ('from', 'to')
+        )
+    except ValueError:
+        return jsonify({'error': 'from/to must be YYYY-MM-DD'}), 400
+    ascending = request.args.get('order', 'desc') == 'asc'
+
+    filters = [Turf.owner_id == user_id]
+    if date_from:
+        filters.append(Booking.booking_date >= date_from)
+    if date_to:
+        filters.append(Booking.booking_date <= date_to)
+    turf_id = request.args.get('turf_id', type=int)
+    if turf_id:
+        filters.append(Booking.turf_id == turf_id)
+
+    if request.args.get('summary') == 'day':
+        rows = db.session.query(
+            Booking.booking_date, func.count(Booking.id), func.coalesce(func.sum(Booking.total_amount), 0)
+        ).join(Turf, Turf.id == Booking.turf_id).filter(*filters) \
+            .group_by(Booking.booking_date).order_by(Booking.booking_date.desc()).all()
+        days = [{'date': str(d), 'bookings': n, 'revenue': float(total)} for d, n, total in rows]
+        return jsonify({
+            'days': days,
+            'total_bookings': sum(d['bookings'] for d in days),
+            'total_revenue': sum(d['revenue'] for d in days)
+        })
 
-    bookings = Booking.query.filter(Booking.turf_id.in_(turf_ids)).order_by(Booking.booking_date.desc(), Booking.start_time).all()
-    
-    return jsonify([{
-        'id': b.id,
-        'turf_name': b.turf.name,
-        'date': str(b.booking_date),
-        'time': str(b.start_time),
-        'status': b.status,
-        'type': b.type,
-        'amount': float(b.total_amount)
-    } for b in bookings])
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            c_date, c_time, c_id = cursor.split(',')
+            # Empty fields stand for NULL (legacy rows without a date or time)
+            c_date = datetime.strptime(c_date, '%Y-%m-%d').date() if c_date else None
+            c_time = datetime.strptime(c_time, '%H:%M:%S').time() if c_time else None
+            c_id = int(c_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        # Continue after (date desc/asc, start_time asc, id asc); MySQL sorts
+        # NULL dates last under DESC, first under ASC, and NULL times first
+        if c_time is None:
+            after_time = or_(Booking.start_time.isnot(None), Booking.id > c_id)
+        else:
+            after_time = or_(Booking.start_time > c_time,
+                             and_(Booking.start_time == c_time, Booking.id > c_id))
+        if c_date is None:
+            same_day = and_(Booking.booking_date.is_(None), after_time)
+            filters.append(or_(same_day, Booking.booking_date.isnot(None)) if ascending else same_day)
+        else:
+            later_day = Booking.booking_date > c_date if ascending \
+                else or_(Booking.booking_date < c_date, Booking.booking_date.is_(None))
+            filters.append(or_(later_day, and_(Booking.booking_date == c_date, after_time)))
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+
+    rows = db.session.query(Booking, Turf.name).join(Turf, Turf.id == Booking.turf_id) \
+        .filter(*filters) \
+        .order_by(Booking.booking_date if ascending else Booking.booking_date.desc(),
+                  Booking.start_time, Booking.id) \
+        .limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        c_time = last.start_time.strftime('%H:%M:%S') if last.start_time else ''
+        next_cursor = f"{last.booking_date or ''},{c_time},{last.id}"
+
+    return jsonify({
+        'items': [{
+            'id': b.id,
+            'turf_name': turf_name,
+            'date': str(b.booking_date),
+            'time': str(b.start_time),
+            'status': b.status,
+            'type': b.type,
+            'amount': float(b.total_amount)
+        } for b, turf_name in page],
+        'next_cursor': next_cursor
+    })
 
 @app.route('/api/owner/turfs', methods=['GET'])
 def get_owner_turfs():
@@ -395,23 +1184,19 @@ def get_owner_turfs():
         'city': t.city,
         'location': t.location,
         'price': float(t.price) if t.price else 0,
-        'image_url': t.image_url,
-        'amenities': t.amenities
+        **image_fields(t.image_url),
+        'amenities': t.amenities,
+        'open_hour': t.open_hour,
+        'close_hour': t.close_hour,
+        'slot_minutes': t.slot_minutes
     } for t in turfs])
 
 @app.route('/api/turfs/add', methods=['POST'])
 def add_turf():
-    # Debug logging
-    with open("backend_debug.log", "a") as f:
-        f.write(f"Received add_turf request at {datetime.now()}\n")
-    
     try:
         data = request.form
         file = request.files.get('image')
-        
-        with open("backend_debug.log", "a") as f:
-            f.write(f"Form data keys: {list(data.keys())}\n")
-            f.write(f"File present: {file is not None}\n")
+        log.debug('add_turf request', extra={'fields': list(data.keys()), 'has_image': file is not None})
 
         owner_id = data.get('owner_id')
         price = data.get('price')
@@ -424,24 +1209,11 @@ def add_turf():
         if not owner:
             return jsonify({'error': 'User session invalid. Please logout and login again.'}), 400
 
+        schedule = parse_schedule(data)
+
         image_url = ''
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            unique_filename = f"{int(datetime.utcnow().timestamp())}_{filename}"
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-            
-            with open("backend_debug.log", "a") as f:
-                f.write(f"Saving file to {file_path}\n")
-            
-            file.save(file_path)
-            
-            with open("backend_debug.log", "a") as f:
-                f.write("File saved successfully.\n")
-                
-            image_url = f"http://localhost:5000/uploads/{unique_filename}"
-
-        with open("backend_debug.log", "a") as f:
-            f.write("Creating DB Entry...\n")
+        if file and file.filename:
+            image_url = save_turf_image(file)
 
         new_turf = Turf(
             name=data.get('name'),
@@ -452,24 +1224,24 @@ def add_turf():
             price=float(price),
             image_url=image_url,
             owner_id=int(owner_id),
-            status='approved'
+            status='approved',
+            open_hour=schedule.open_hour,
+            close_hour=schedule.close_hour,
+            slot_minutes=schedule.slot_minutes
         )
         db.session.add(new_turf)
+        bump_stat('turfs')
         db.session.commit()
-        
-        with open("backend_debug.log", "a") as f:
-            f.write(f"DB Entry created. ID: {new_turf.id}\n")
-            
+        turf_index.upsert(new_turf)
+        log.info('Turf added', extra={'turf_id': new_turf.id, 'owner_id': new_turf.owner_id, 'image_url': image_url})
+
         return jsonify({'message': 'Turf added successfully', 'id': new_turf.id}), 201
     except ValueError as e:
-        with open("backend_debug.log", "a") as f:
-            f.write(f"ValueError: {e}\n")
+        log.info('add_turf rejected', extra={'reason': str(e)})
         return jsonify({'error': f"Invalid data format: {str(e)}"}), 400
     except Exception as e:
         db.session.rollback()
-        with open("backend_debug.log", "a") as f:
-            f.write(f"Exception: {e}\n")
-        print(f"Error adding turf: {e}")
+        log.exception('Adding turf failed')
         return jsonify({'error': str(e)}), 500
 
 
@@ -493,13 +1265,21 @@ def update_turf(turf_id):
     turf.amenities = data.get('amenities', turf.amenities)
     if data.get('price'):
         turf.price = float(data.get('price'))
-    if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        unique_filename = f"{int(datetime.utcnow().timestamp())}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        turf.image_url = f"http://localhost:5000/uploads/{unique_filename}"
+    if any(has_field(data, k) for k in SCHEDULE_FIELDS):
+        try:
+            schedule = parse_schedule(data, Schedule.for_turf(turf))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        turf.open_hour, turf.close_hour, turf.slot_minutes = schedule
+        occupancy.drop_turf(turf.id)
+    if file and file.filename:
+        try:
+            turf.image_url = save_turf_image(file)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    bump_version(f'turf:{turf.id}')
     db.session.commit()
+    turf_index.upsert(turf)
     return jsonify({'message': 'Turf updated successfully'})
 
 @app.route('/api/turfs/<int:turf_id>', methods=['DELETE'])
@@ -510,120 +1290,224 @@ def delete_turf(turf_id):
     if not owner_id or int(owner_id) != turf.owner_id:
         return jsonify({'error': 'Unauthorized'}), 403
     try:
+        # Headline totals follow the rows; the daily series keeps its history
+        removed, removed_revenue = db.session.query(
+            func.count(Booking.id), func.coalesce(func.sum(Booking.total_amount), 0)
+        ).filter(Booking.turf_id == turf_id).one()
+        bump_stat('bookings', -removed)
+        bump_stat('revenue', -removed_revenue)
+        bump_stat('turfs', -1)
+        if turf.status == 'pending':
+            bump_stat('pending_turfs', -1)
+        SlotLock.query.filter_by(turf_id=turf_id).delete()
         Booking.query.filter_by(turf_id=turf_id).delete()
         Rating.query.filter_by(turf_id=turf_id).delete()
+        TurfRatingStats.query.filter_by(turf_id=turf_id).delete()
         db.session.delete(turf)
+        bump_version(f'turf:{turf_id}')
         db.session.commit()
+        turf_index.remove(turf_id)
+        occupancy.drop_turf(turf_id)
         return jsonify({'message': 'Turf deleted successfully'})
     except Exception as e:
         db.session.rollback()
+        log.exception('Deleting turf failed', extra={'turf_id': turf_id})
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/turfs', methods=['GET'])
 def get_turfs():
     city = request.args.get('city')
-    query = Turf.query
     if city:
-        query = query.filter(Turf.city.ilike(f'%{city}%'))
-    turfs = query.all()
-    result = []
-    for t in turfs:
-        avg = db.session.query(func.avg(Rating.stars)).filter_by(turf_id=t.id).scalar()
-        result.append({
-            'id': t.id, 
-            'name': t.name, 
-            'sport_type': t.sport_type,
-            'city': t.city,
-            'location': t.location, 
-            'amenities': t.amenities.split(',') if t.amenities else [],
-            'price': float(t.price) if t.price else 0,
-            'image_url': t.image_url,
-            'avg_rating': round(float(avg), 1) if avg else None
-        })
-    return jsonify(result)
+        index = get_turf_index()
+        _, ids = index.search(city=city, limit=len(index))
+        return jsonify(load_turfs(ids))
+    return jsonify([serialize_turf(t, count, total) for t, count, total in turf_listing_query().all()])
+
+@app.route('/api/turfs/search', methods=['GET'])
+def search_turfs():
+    args = request.args
+    try:
+        page = max(int(args.get('page', 1)), 1)
+        per_page = min(max(int(args.get('per_page', 20)), 1), 100)
+        min_price = float(args['min_price']) if args.get('min_price') else None
+        max_price = float(args['max_price']) if args.get('max_price') else None
+    except ValueError:
+        return jsonify({'error': 'Invalid page or price filter'}), 400
+    sort = args.get('sort', 'relevance')
+    if sort not in SORTS:
+        return jsonify({'error': f"sort must be one of {', '.join(SORTS)}"}), 400
+    amenities = [a for a in args.get('amenities', '').split(',') if a.strip()]
+
+    total, ids = get_turf_index().search(
+        q=args.get('q'), city=args.get('city'), sport_type=args.get('sport_type'),
+        min_price=min_price, max_price=max_price, amenities=amenities,
+        sort=sort, offset=(page - 1) * per_page, limit=per_page
+    )
+    return jsonify({
+        'results': load_turfs(ids),
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    })
 
 @app.route('/api/turfs/<int:id>', methods=['GET'])
 def get_turf_details(id):
-    t = Turf.query.get_or_404(id)
-    avg = db.session.query(func.avg(Rating.stars)).filter_by(turf_id=t.id).scalar()
-    return jsonify({
-        'id': t.id, 
-        'name': t.name, 
-        'sport_type': t.sport_type,
-        'city': t.city,
-        'location': t.location, 
-        'amenities': t.amenities.split(',') if t.amenities else [],
-        'price': float(t.price) if t.price else 0,
-        'image_url': t.image_url,
-        'avg_rating': round(float(avg), 1) if avg else None
-    })
+    def build():
+        row = turf_listing_query().filter(Turf.id == id).first()
+        if not row:
+            abort(404)
+        return serialize_turf(*row)
+    return versioned_json(f'turf:{id}', build)
 
 @app.route('/api/turfs/<int:id>/slots', methods=['GET'])
+@primary_db
 def get_slots(id):
     date_str = request.args.get('date') # YYYY-MM-DD
     if not date_str:
         return jsonify([])
-    
-    # Generate static slots for now (e.g. 9 AM to 10 PM)
-    slots = []
-    base_time = datetime.strptime(date_str, '%Y-%m-%d')
-    
-    # Fetch existing bookings for this turf and date
-    bookings = Booking.query.filter_by(turf_id=id, booking_date=date_str, status='confirmed').all()
-    booked_times = [b.start_time.strftime('%H:%M') for b in bookings]
-
-    for hour in range(9, 23): # 9 AM to 11 PM
-        start_time = f"{hour:02d}:00"
-        end_time = f"{hour+1:02d}:00"
-        is_booked = start_time in booked_times
-        slots.append({
-            'id': hour, # Simple ID
-            'time': f"{start_time} - {end_time}",
-            'available': not is_booked,
-            'start_raw': start_time
-        })
-    return jsonify(slots)
+    try:
+        day = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'date must be YYYY-MM-DD'}), 400
+
+    turf = Turf.query.get_or_404(id)
+    schedule = Schedule.for_turf(turf)
+    bits = occupancy.get_many({turf.id: schedule}, [day], taken_start_times)[(turf.id, day)]
+    return jsonify(schedule.slots(bits))
+
+@app.route('/api/availability', methods=['GET'])
+@primary_db
+def get_availability():
+    """Free slots for many turfs over a date range, e.g. football in Pune this weekend.
+
+    Turfs are picked by turf_ids=1,2,3 or by city / sport_type through the
+    search index; bookings for every turf-day come from one query.
+    """
+    args = request.args
+    try:
+        start = datetime.strptime(args.get('from', ''), '%Y-%m-%d').date()
+        end = datetime.strptime(args.get('to') or args.get('from', ''), '%Y-%m-%d').date()
+        turf_ids = [int(i) for i in args.get('turf_ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'error': 'from/to must be YYYY-MM-DD and turf_ids a list of ids'}), 400
+    if end < start or (end - start).days >= 14:
+        return jsonify({'error': 'Date range must be 1 to 14 days'}), 400
+
+    if not turf_ids:
+        if not args.get('city') and not args.get('sport_type'):
+            return jsonify({'error': 'Give turf_ids, city or sport_type'}), 400
+        _, turf_ids = get_turf_index().search(
+            city=args.get('city'), sport_type=args.get('sport_type'), sort='name', limit=200)
+    turfs = Turf.query.filter(Turf.id.in_(turf_ids[:200])).all() if turf_ids else []
+    turfs.sort(key=lambda t: turf_ids.index(t.id))
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    schedules = {t.id: Schedule.for_turf(t) for t in turfs}
+    bitmaps = occupancy.get_many(schedules, days, taken_start_times) if turfs else {}
+    return jsonify({
+        'from': str(start),
+        'to': str(end),
+        'results': [{
+            'turf_id': t.id,
+            'name': t.name,
+            'city': t.city,
+            'sport_type': t.sport_type,
+            'price': float(t.price) if t.price else 0,
+            'days': [{
+                'date': str(day),
+                'free_slots': schedules[t.id].free_starts(bitmaps[(t.id, day)])
+            } for day in days]
+        } for t in turfs]
+    })
+
+@app.route('/api/slots/hold', methods=['POST'])
+def hold_slot():
+    """Reserve a slot for SLOT_HOLD_SECONDS while the user completes payment."""
+    data = request.json or {}
+    user_id = data.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'user_id is required'}), 400
+    try:
+        turf, day, start = parse_slot(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        acquired = acquire_slot(turf.id, day, start, user_id, hold_seconds=SLOT_HOLD_SECONDS)
+    except OperationalError as e:
+        if not is_lock_conflict(e):
+            raise
+        acquired = False
+    if not acquired:
+        db.session.rollback()
+        return jsonify({'error': 'Slot already booked'}), 409
+    db.session.commit()
+    occupancy.invalidate(turf.id, day)
+    return jsonify({
+        'message': 'Slot held',
+        'expires_at': (datetime.now() + timedelta(seconds=SLOT_HOLD_SECONDS)).isoformat(timespec='seconds')
+    }), 201
+
+@app.route('/api/slots/hold', methods=['DELETE'])
+def release_slot():
+    data = request.json or {}
+    try:
+        turf, day, start = parse_slot(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    released = SlotLock.query.filter(
+        SlotLock.turf_id == turf.id, SlotLock.booking_date == day, SlotLock.start_time == start,
+        SlotLock.user_id == data.get('user_id'), SlotLock.expires_at.isnot(None)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    occupancy.invalidate(turf.id, day)
+    return jsonify({'released': released})
 
 @app.route('/api/book', methods=['POST'])
 def book_turf():
     data = request.json
+    try:
+        turf, booking_day, slot_start = parse_slot(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         user_id = data.get('user_id')
-        start_time = data.get('start_time', '00:00')
         total_amount = float(data.get('amount', 0))
         num_players = int(data.get('num_players', 1))
         payment_type = data.get('type', 'online')  # 'online' = full, 'split' = advance
 
-        # Fetch username for game_id
         booker = User.query.get(user_id)
         username = booker.username.split('@')[0] if booker else 'player'
 
-        # Format slot label e.g. "09AM" / "14PM"
-        try:
-            hour = int(start_time.split(':')[0])
-            slot_label = f"{hour:02d}{'AM' if hour < 12 else 'PM'}"
-        except:
-            slot_label = start_time.replace(':', '')
-
-        game_id = f"{username}-{slot_label}"
-
         # Advance = 20% of total for split bookings
         advance_amount = round(total_amount * 0.20, 2) if payment_type == 'split' else total_amount
 
         new_booking = Booking(
             user_id=user_id,
-            turf_id=data.get('turf_id'),
-            booking_date=data.get('date'),
-            start_time=start_time,
+            turf_id=turf.id,
+            booking_date=booking_day,
+            start_time=slot_start,
             total_amount=total_amount,
             advance_amount=advance_amount,
             num_players=num_players,
-            game_id=game_id,
+            amount_collected=advance_amount,   # organiser's payment below
+            slots_filled=1,
             status='confirmed',
             type=payment_type
         )
-        db.session.add(new_booking)
-        db.session.flush()  # get new_booking.id before commit
+        for attempt in range(5):
+            new_booking.game_id = new_game_code()
+            try:
+                with db.session.begin_nested():  # flushes, so new_booking.id is set
+                    db.session.add(new_booking)
+                break
+            except IntegrityError:
+                if attempt == 4:
+                    raise
+        game_id = new_booking.game_id
+
+        if not acquire_slot(turf.id, booking_day, slot_start, user_id, booking_id=new_booking.id):
+            db.session.rollback()
+            return jsonify({'error': 'Slot already booked'}), 409
 
         # Record organiser's own payment
         organiser_payment = GamePayment(
@@ -634,7 +1518,9 @@ def book_turf():
             upi_ref='ORGANISER'
         )
         db.session.add(organiser_payment)
+        record_booking_stats(turf.city, total_amount)
         db.session.commit()
+        occupancy.invalidate(turf.id, booking_day)
 
         return jsonify({
             'message': 'Booking confirmed',
@@ -645,32 +1531,37 @@ def book_turf():
         }), 201
     except Exception as e:
         db.session.rollback()
+        if is_lock_conflict(e):
+            return jsonify({'error': 'Slot already booked'}), 409
+        log.exception('Booking failed')
         return jsonify({'error': str(e)}), 500
 
 # ── Public: fetch game details by game_id (for join link) ──────────────────
 @app.route('/api/game/<game_id>', methods=['GET'])
+@primary_db
 def get_game_details(game_id):
-    booking = Booking.query.filter_by(game_id=game_id).order_by(Booking.created_at.desc()).first()
-    if not booking:
+    organiser, owner = db.aliased(User), db.aliased(User)
+    row = find_game(game_id, db.session.query(
+        Booking, Turf.name, Turf.location, organiser.name, owner.upi_id
+    ).outerjoin(Turf, Turf.id == Booking.turf_id
+    ).outerjoin(organiser, organiser.id == Booking.user_id
+    ).outerjoin(owner, owner.id == Turf.owner_id))
+    if not row:
         return jsonify({'error': 'Game not found'}), 404
 
-    turf = booking.turf
-    organiser = User.query.get(booking.user_id)
-    payments = GamePayment.query.filter_by(booking_id=booking.id).all()
+    booking, turf_name, turf_location, organiser_name, owner_upi = row
+    payments = GamePayment.query.filter_by(booking_id=booking.id).order_by(GamePayment.id).all()
     total = float(booking.total_amount)
     num_players = booking.num_players or 1
     share_per_player = round(total / num_players, 2)
-    amount_collected = sum(float(p.amount_paid) for p in payments)
+    amount_collected = float(booking.amount_collected or 0)
     remaining = round(total - amount_collected, 2)
 
-    # Owner UPI details (stored on turf owner's user record if available)
-    owner = User.query.get(turf.owner_id) if turf else None
-
     return jsonify({
-        'game_id': game_id,
+        'game_id': booking.game_id,
         'booking_id': booking.id,
-        'turf_name': turf.name if turf else '',
-        'turf_location': turf.location if turf else '',
+        'turf_name': turf_name or '',
+        'turf_location': turf_location or '',
         'date': str(booking.booking_date),
         'time': str(booking.start_time)[:5] if booking.start_time else '',
         'total_amount': total,
@@ -678,15 +1569,15 @@ def get_game_details(game_id):
         'share_per_player': share_per_player,
         'amount_collected': round(amount_collected, 2),
         'remaining': remaining,
-        'organiser': organiser.name if organiser else 'Unknown',
-        'owner_upi': owner.upi_id if owner and owner.upi_id else None,
+        'organiser': organiser_name or 'Unknown',
+        'owner_upi': owner_upi or None,
         'payments': [{
             'player_name': p.player_name,
             'amount_paid': float(p.amount_paid),
             'upi_ref': p.upi_ref or '',
             'paid_at': p.paid_at.strftime('%H:%M') if p.paid_at else ''
         } for p in payments],
-        'slots_filled': len(payments),
+        'slots_filled': booking.slots_filled or 0,
         'status': booking.status
     })
 
@@ -694,7 +1585,7 @@ def get_game_details(game_id):
 @app.route('/api/game/<game_id>/pay', methods=['POST'])
 def pay_game_share(game_id):
     data = request.json
-    booking = Booking.query.filter_by(game_id=game_id).order_by(Booking.created_at.desc()).first()
+    booking = find_game(game_id)
     if not booking:
         return jsonify({'error': 'Game not found'}), 404
 
@@ -711,11 +1602,6 @@ def pay_game_share(game_id):
     num_players = booking.num_players or 1
     share = round(total / num_players, 2)
 
-    # Check if already paid (by name)
-    existing = GamePayment.query.filter_by(booking_id=booking.id, player_name=player_name).first()
-    if existing:
-        return jsonify({'error': f'{player_name} has already paid their share'}), 409
-
     payment = GamePayment(
         booking_id=booking.id,
         player_name=player_name,
@@ -723,16 +1609,17 @@ def pay_game_share(game_id):
         amount_paid=share,
         upi_ref=upi_ref or None
     )
-    db.session.add(payment)
+    # The unique (booking_id, player_name) index decides duplicate payers
+    if not record_game_payment(payment):
+        db.session.rollback()
+        return jsonify({'error': f'{player_name} has already paid their share'}), 409
     db.session.commit()
 
-    payments = GamePayment.query.filter_by(booking_id=booking.id).all()
-    amount_collected = sum(float(p.amount_paid) for p in payments)
-
+    amount_collected = float(booking.amount_collected or 0)
     return jsonify({
         'message': f'Payment of ₹{share} recorded for {player_name}',
         'share_paid': share,
-        'slots_filled': len(payments),
+        'slots_filled': booking.slots_filled,
         'amount_collected': round(amount_collected, 2),
         'remaining': round(total - amount_collected, 2)
     }), 201
@@ -740,8 +1627,7 @@ def pay_game_share(game_id):
 @app.route('/api/users/<int:id>', methods=['GET'])
 def get_user_public(id):
     u = User.query.get_or_404(id)
-    online_threshold = datetime.now() - timedelta(minutes=2)
-    is_really_online = u.last_seen is not None and u.last_seen > online_threshold
+    is_really_online = presence.is_online(u.id, u.last_seen)
     return jsonify({
         'id': u.id, 'name': u.name, 'uid': u.uid,
         'is_online': is_really_online,
@@ -760,28 +1646,81 @@ def update_upi(id):
 
 @app.route('/api/users/<int:user_id>/bookings', methods=['GET'])
 def get_user_bookings(user_id):
-    now = datetime.utcnow()
-    bookings = Booking.query.filter_by(user_id=user_id).order_by(Booking.created_at.desc()).all()
-    result = []
-    for b in bookings:
+    """A user's booking history, newest first, with their rating of each.
+
+    ?scope=upcoming|completed splits the history (default: both); pages are
+    ?limit= (max 100) long and continue from next_cursor passed as ?cursor=.
+    """
+    # A session counts as completed an hour after it starts. Rows missing a
+    # date or time never do (they are upcoming); the explicit IS NOT NULL
+    # checks keep the predicate FALSE rather than NULL for them, so ~ works
+    cutoff = datetime.utcnow() - timedelta(hours=1)
+    is_completed = and_(
+        Booking.booking_date.isnot(None),
+        Booking.start_time.isnot(None),
+        or_(
+            Booking.booking_date < cutoff.date(),
+            and_(Booking.booking_date == cutoff.date(), Booking.start_time < cutoff.time())
+        )
+    )
+    completed_col = case((is_completed, True), else_=False)
+
+    query = db.session.query(Booking, Turf.name, Rating.stars, completed_col) \
+        .join(Turf, Turf.id == Booking.turf_id) \
+        .outerjoin(Rating, Rating.booking_id == Booking.id) \
+        .filter(Booking.user_id == user_id)
+    scope = request.args.get('scope')
+    if scope == 'completed':
+        query = query.filter(is_completed)
+    elif scope == 'upcoming':
+        query = query.filter(~is_completed)
+    elif scope:
+        return jsonify({'error': 'scope must be upcoming or completed'}), 400
+
+    # The total only comes with the first page; later pages reuse it client-side
+    cursor = request.args.get('cursor')
+    total = None if cursor else query.count()
+    if cursor:
         try:
-            booking_end = datetime.combine(b.booking_date, b.start_time) + timedelta(hours=1)
-            is_completed = booking_end < now
-        except:
-            is_completed = False
-        existing_rating = Rating.query.filter_by(booking_id=b.id).first()
-        result.append({
+            c_created, c_id = cursor.rsplit(',', 1)
+            # An empty timestamp stands for NULL (legacy rows without created_at)
+            c_created = datetime.fromisoformat(c_created) if c_created else None
+            c_id = int(c_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        # NULL created_at sorts last under DESC; those rows page by id alone
+        if c_created is None:
+            query = query.filter(Booking.created_at.is_(None), Booking.id < c_id)
+        else:
+            query = query.filter(or_(
+                Booking.created_at < c_created,
+                Booking.created_at.is_(None),
+                and_(Booking.created_at == c_created, Booking.id < c_id)
+            ))
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 100)
+
+    rows = query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = f"{last.created_at.isoformat() if last.created_at else ''},{last.id}"
+
+    return jsonify({
+        'items': [{
             'id': b.id,
             'turf_id': b.turf_id,
-            'turf_name': b.turf.name,
+            'turf_name': turf_name,
             'date': str(b.booking_date),
             'time': str(b.start_time),
             'amount': float(b.total_amount),
             'status': b.status,
-            'is_completed': is_completed,
-            'rating': existing_rating.stars if existing_rating else None
-        })
-    return jsonify(result)
+            'is_completed': bool(completed),
+            'rating': stars
+        } for b, turf_name, stars, completed in page],
+        'total': total,
+        'next_cursor': next_cursor
+    })
 
 @app.route('/api/ratings', methods=['POST'])
 def submit_rating():
@@ -803,46 +1742,45 @@ def submit_rating():
         booking_id=int(booking_id), stars=int(stars), review=review
     )
     db.session.add(rating)
+    # Keep the per-turf totals in the same transaction as the rating itself
+    upsert(TurfRatingStats, {'turf_id': int(turf_id), 'rating_count': 1, 'rating_sum': int(stars)}, {
+        'rating_count': TurfRatingStats.rating_count + 1,
+        'rating_sum': TurfRatingStats.rating_sum + int(stars)
+    })
+    bump_version(f'turf:{int(turf_id)}')
     db.session.commit()
     return jsonify({'message': 'Rating submitted successfully'}), 201
 
 @app.route('/api/users/<int:user_id>/friends', methods=['GET'])
 def get_friends(user_id):
-    friends_rel = Friend.query.filter(
-        (Friend.user_id == user_id) | (Friend.friend_id == user_id),
-        Friend.status == 'accepted'
+    # Friend rows are stored one-way; each half of the union is served by an
+    # index (the primary key, or ix_friends_friend) instead of an OR scan
+    friend_ids = db.session.query(Friend.friend_id).filter(
+        Friend.user_id == user_id, Friend.status == 'accepted'
+    ).union_all(db.session.query(Friend.user_id).filter(
+        Friend.friend_id == user_id, Friend.status == 'accepted'
+    )).subquery()
+    rows = db.session.query(User, Conversation, Message.content, Message.sender_id).join(
+        friend_ids, User.id == friend_ids.c[0]
+    ).outerjoin(Conversation, or_(
+        and_(Conversation.user_low_id == user_id, Conversation.user_high_id == User.id),
+        and_(Conversation.user_low_id == User.id, Conversation.user_high_id == user_id)
+    )).outerjoin(
+        Message, Message.id == Conversation.last_message_id
+    ).order_by(
+        # Friends with messages first, most recent conversation on top
+        Conversation.last_message_id.is_(None), Conversation.last_message_id.desc()
     ).all()
 
-    friend_ids = []
-    for f in friends_rel:
-        friend_ids.append(f.friend_id if f.user_id == user_id else f.user_id)
-
-    friends = User.query.filter(User.id.in_(friend_ids)).all()
-
-    online_threshold = datetime.now() - timedelta(minutes=2)
+    now = datetime.now()
     results = []
-    for u in friends:
-        # Last message between user_id and this friend
-        last_msg = Message.query.filter(
-            ((Message.sender_id == user_id) & (Message.receiver_id == u.id)) |
-            ((Message.sender_id == u.id) & (Message.receiver_id == user_id))
-        ).order_by(Message.timestamp.desc()).first()
-
-        # Unread = messages FROM friend that user hasn't read
-        last_sent = Message.query.filter_by(sender_id=user_id, receiver_id=u.id).order_by(Message.timestamp.desc()).first()
-        if last_sent:
-            unread = Message.query.filter(
-                Message.sender_id == u.id,
-                Message.receiver_id == user_id,
-                Message.timestamp > last_sent.timestamp
-            ).count()
-        else:
-            unread = Message.query.filter_by(sender_id=u.id, receiver_id=user_id).count()
-
+    for u, conv, last_text, last_sender_id in rows:
         # Real online: last_seen within 2 minutes (heartbeat-based)
-        is_really_online = (
-            u.last_seen is not None and u.last_seen > online_threshold
-        )
+        is_really_online = presence.is_online(u.id, u.last_seen, now)
+        if conv:
+            unread = conv.unread_low if user_id < u.id else conv.unread_high
+        else:
+            unread = 0
 
         results.append({
             'id': u.id,
@@ -850,15 +1788,11 @@ def get_friends(user_id):
             'uid': u.uid,
             'status': 'online' if is_really_online else 'offline',
             'is_online': is_really_online,
-            'last_message': last_msg.content if last_msg else None,
-            'last_message_time': last_msg.timestamp.strftime('%H:%M') if last_msg else None,
-            'last_message_from_me': last_msg.sender_id == user_id if last_msg else None,
+            'last_message': last_text,
+            'last_message_time': conv.last_timestamp.strftime('%H:%M') if conv and conv.last_timestamp else None,
+            'last_message_from_me': last_sender_id == user_id if last_text is not None else None,
             'unread_count': unread
         })
-
-    # Sort: friends with messages first, then by time desc
-    results.sort(key=lambda x: (x['last_message'] is None, x['last_message_time'] or ''), reverse=False)
-    results.sort(key=lambda x: x['last_message'] is None)
     return jsonify(results)
 
 @app.route('/api/users/<int:user_id>/requests', methods=['get'])
@@ -867,19 +1801,70 @@ def get_friend_requests(user_id):
     senders = User.query.filter(User.id.in_([r.user_id for r in reqs])).all()
     return jsonify([{'id': u.id, 'name': u.name} for u in senders])
 
+# In-process people index over regular users (see people_search.py)
+people_index = PeopleSearchIndex(max_age=int(os.getenv('PEOPLE_INDEX_MAX_AGE', 300)))
+
+def get_people_index():
+    if people_index.is_stale():
+        people_index.rebuild(db.session.query(User.id, User.name, User.uid).filter(User.role == 'user').all())
+    return people_index
+
+def friendship_states(user_id, ids):
+    """{other_id: 'friends' | 'request_sent' | 'request_received'} from one query."""
+    if not user_id or not ids:
+        return {}
+    rows = db.session.query(Friend.user_id, Friend.friend_id, Friend.status).filter(or_(
+        and_(Friend.user_id == user_id, Friend.friend_id.in_(ids)),
+        and_(Friend.friend_id == user_id, Friend.user_id.in_(ids))
+    )).all()
+    states = {}
+    for sender, receiver, status in rows:
+        other = receiver if sender == user_id else sender
+        if status == 'accepted':
+            states[other] = 'friends'
+        elif states.get(other) != 'friends':
+            states[other] = 'request_sent' if sender == user_id else 'request_received'
+    return states
+
 @app.route('/api/users/search', methods=['GET'])
 def search_users():
-    query = request.args.get('q', '').strip()
-    if query:
-        # Only regular users — no admins or owners
-        users = User.query.filter(
-            User.name.ilike(f'%{query}%'),
-            User.role == 'user'
-        ).limit(50).all()
-    else:
-        # Return all regular users (for "All People" tab)
-        users = User.query.filter_by(role='user').limit(100).all()
-    return jsonify([{'id': u.id, 'name': u.name, 'uid': u.uid} for u in users])
+    """Ranked people search by name or UID prefix, with typo tolerance.
+
+    ?user_id= is the searcher: they are left out of the results and each hit
+    carries its friendship state relative to them. An empty ?q= lists
+    everyone alphabetically. Pages are ?limit= (max 50) long; pass
+    next_cursor back as ?cursor=.
+    """
+    user_id = request.args.get('user_id', type=int)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    try:
+        cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    hits, next_cursor = get_people_index().search(
+        request.args.get('q', '').strip(), cursor=cursor, limit=limit, exclude=user_id)
+    ids = [h.id for h in hits]
+    states = friendship_states(user_id, ids)
+    mutual = get_friend_graph().mutual_counts(user_id, ids) if user_id else {}
+    return jsonify({
+        'items': [{
+            'id': h.id,
+            'name': h.display,
+            'uid': h.uid,
+            'friendship': states.get(h.id, 'none'),
+            'mutual_friends': mutual.get(h.id, 0)
+        } for h in hits],
+        'next_cursor': next_cursor
+    })
+
+# Accepted friendships as in-memory adjacency sets (see friend_graph.py)
+friend_graph = FriendGraph(max_age=int(os.getenv('FRIEND_GRAPH_MAX_AGE', 300)))
+
+def get_friend_graph():
+    friend_graph.refresh(lambda: db.session.query(Friend.user_id, Friend.friend_id)
+                         .filter(Friend.status == 'accepted').all())
+    return friend_graph
 
 @app.route('/api/friends/request', methods=['POST'])
 def send_friend_request():
@@ -900,17 +1885,97 @@ def respond_friend_request():
     if req:
         req.status = 'accepted'
         db.session.commit()
+        friend_graph.add(req.user_id, req.friend_id)
     return jsonify({'message': 'Accepted'})
 
-@app.route('/api/messages', methods=['GET'])
-def get_messages():
-    user_id = int(request.args.get('user_id', 0))
-    friend_id = int(request.args.get('friend_id', 0))
-
-    if not user_id or not friend_id:
-        return jsonify([])
-
-    # Auto-mark all messages FROM friend TO user as read (user is now viewing the chat)
+@app.route('/api/users/<int:user_id>/mutual/<int:other_id>', methods=['GET'])
+def get_mutual_friends(user_id, other_id):
+    ids = get_friend_graph().mutual(user_id, other_id)
+    users = db.session.query(User.id, User.name).filter(User.id.in_(ids)).order_by(User.name).all() if ids else []
+    return jsonify({'count': len(ids), 'friends': [{'id': i, 'name': n} for i, n in users]})
+
+@app.route('/api/users/<int:user_id>/suggestions', methods=['GET'])
+def get_friend_suggestions(user_id):
+    """People you may know: friends of friends, ranked by mutual friend count."""
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    # Anyone with a request in flight either way is already being handled
+    pending = db.session.query(Friend.friend_id).filter(Friend.user_id == user_id, Friend.status == 'pending') \
+        .union_all(db.session.query(Friend.user_id).filter(Friend.friend_id == user_id, Friend.status == 'pending')).all()
+    ranked = get_friend_graph().suggestions(user_id, None, exclude={i for i, in pending})
+    # Owners, admins and banned users are filtered out in SQL, so check the
+    # ranking a chunk at a time until enough eligible people are found
+    result = []
+    for start in range(0, len(ranked), limit * 2):
+        chunk = ranked[start:start + limit * 2]
+        users = {u.id: u for u in db.session.query(User.id, User.name, User.uid).filter(
+            User.id.in_([i for i, _ in chunk]), User.role == 'user', User.is_banned.isnot(True)).all()}
+        result += [{'id': i, 'name': users[i].name, 'uid': users[i].uid, 'mutual_friends': mutual}
+                   for i, mutual in chunk if i in users]
+        if len(result) >= limit:
+            break
+    return jsonify(result[:limit])
+
+# In-process fan-out of chat events to open /events streams (see chat_events.py)
+chat_broker = LocalBroker()
+
+def serialize_message(m, sender_name):
+    return {
+        'id': m.id,
+        'text': m.content,
+        'sender': sender_name or 'Unknown',
+        'sender_id': m.sender_id,
+        'receiver_id': m.receiver_id,
+        'time': m.timestamp.strftime('%H:%M'),
+        'date': m.timestamp.strftime('%Y-%m-%d'),
+        'is_read': bool(m.is_read),
+        'read_at': m.read_at.strftime('%H:%M') if m.read_at else None,
+    }
+
+def sender_names(msgs):
+    """{user_id: name} for every sender in msgs, from a single query."""
+    ids = {m.sender_id for m in msgs}
+    if not ids:
+        return {}
+    return dict(db.session.query(User.id, User.name).filter(User.id.in_(ids)).all())
+
+def conversation_filter(user_id, friend_id):
+    return ((Message.sender_id == user_id) & (Message.receiver_id == friend_id)) | \
+           ((Message.sender_id == friend_id) & (Message.receiver_id == user_id))
+
+def conversation_query(a, b):
+    low, high = min(a, b), max(a, b)
+    return Conversation.query.filter_by(user_low_id=low, user_high_id=high)
+
+def unread_column(reader_id, other_id):
+    return Conversation.unread_low if reader_id < other_id else Conversation.unread_high
+
+def conversation_upsert(sender_id, receiver_id, msg_id, timestamp):
+    """INSERT ... ON DUPLICATE KEY UPDATE folding message msg_id into its conversation row."""
+    low, high = min(sender_id, receiver_id), max(sender_id, receiver_id)
+    unread = unread_column(receiver_id, sender_id)
+    # Never move backwards if two sends commit out of order
+    is_newer = or_(Conversation.last_message_id.is_(None), Conversation.last_message_id < msg_id)
+    # MySQL applies the assignments left to right and later ones see earlier
+    # results, so last_message_id has to be assigned after the test reading it
+    return mysql_insert(Conversation).values(
+        user_low_id=low, user_high_id=high,
+        last_message_id=msg_id, last_timestamp=timestamp,
+        unread_low=1 if receiver_id == low else 0,
+        unread_high=1 if receiver_id == high else 0
+    ).on_duplicate_key_update([
+        ('last_timestamp', case((is_newer, timestamp), else_=Conversation.last_timestamp)),
+        ('last_message_id', case((is_newer, msg_id), else_=Conversation.last_message_id)),
+        (unread.key, unread + 1),
+    ])
+
+def record_message(msg):
+    """Fold a flushed message into its conversation row (same transaction)."""
+    # One statement: the first two messages of a new chat cannot collide on the insert
+    db.session.execute(conversation_upsert(
+        int(msg.sender_id), int(msg.receiver_id), msg.id, msg.timestamp))
+
+def mark_conversation_read(user_id, friend_id):
+    """Mark everything friend_id sent to user_id as read; returns the count."""
     unread_msgs = Message.query.filter_by(
         sender_id=friend_id, receiver_id=user_id, is_read=False
     ).all()
@@ -919,28 +1984,108 @@ def get_messages():
         m.is_read = True
         m.read_at = now
     if unread_msgs:
+        conversation_query(user_id, friend_id).update(
+            {unread_column(user_id, friend_id): 0}, synchronize_session=False)
         db.session.commit()
+        publish_read_receipt(user_id, friend_id, unread_msgs)
+    return len(unread_msgs)
+
+def publish_read_receipt(reader_id, sender_id, messages):
+    """Tell the sender their messages to reader_id have been read."""
+    if messages:
+        chat_broker.publish(sender_id, ChatEvent(None, 'read', {
+            'reader_id': reader_id,
+            'up_to_id': max(m.id for m in messages)
+        }))
+
+@app.route('/api/users/<int:user_id>/events', methods=['GET'])
+@primary_db
+def chat_events(user_id):
+    """Server-sent event stream of new messages and read receipts for user_id."""
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    q = chat_broker.subscribe(user_id)
+    backlog = []
+    try:
+        if last_id and last_id.isdigit():
+            # Replay what arrived while the client was disconnected
+            missed = Message.query.filter(
+                Message.receiver_id == user_id, Message.id > int(last_id)
+            ).order_by(Message.id).limit(200).all()
+            names = sender_names(missed)
+            backlog = [ChatEvent(m.id, 'message', serialize_message(m, names.get(m.sender_id)))
+                       for m in missed]
+    except Exception:
+        chat_broker.unsubscribe(user_id, q)
+        raise
+    # The generator runs after this request's DB session is released
+    return Response(event_stream(chat_broker, user_id, q, backlog),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/messages', methods=['GET'])
+@primary_db
+def get_messages():
+    """Latest 100 messages, oldest first; ?since_id= returns only newer rows."""
+    user_id = int(request.args.get('user_id', 0))
+    friend_id = int(request.args.get('friend_id', 0))
+    since_id = request.args.get('since_id', type=int)
 
-    # Fetch messages between these two users
-    msgs = Message.query.filter(
-        ((Message.sender_id == user_id) & (Message.receiver_id == friend_id)) |
-        ((Message.sender_id == friend_id) & (Message.receiver_id == user_id))
-    ).order_by(Message.timestamp).limit(100).all()
+    if not user_id or not friend_id:
+        return jsonify([])
 
-    results = []
-    for m in msgs:
-        sender = User.query.get(m.sender_id)
-        results.append({
-            'id': m.id,
-            'text': m.content,
-            'sender': sender.name if sender else 'Unknown',
-            'sender_id': m.sender_id,
-            'time': m.timestamp.strftime('%H:%M'),
-            'date': m.timestamp.strftime('%Y-%m-%d'),
-            'is_read': bool(m.is_read),
-            'read_at': m.read_at.strftime('%H:%M') if m.read_at else None,
-        })
-    return jsonify(results)
+    # Auto-mark all messages FROM friend TO user as read (user is now viewing the chat)
+    mark_conversation_read(user_id, friend_id)
+
+    query = Message.query.filter(conversation_filter(user_id, friend_id))
+    if since_id:
+        msgs = query.filter(Message.id > since_id).order_by(Message.id).limit(100).all()
+    else:
+        msgs = query.order_by(Message.id.desc()).limit(100).all()[::-1]
+
+    names = sender_names(msgs)
+    return jsonify([serialize_message(m, names.get(m.sender_id)) for m in msgs])
+
+@app.route('/api/messages/history', methods=['GET'])
+@primary_db
+def get_message_history():
+    """Keyset-paginated conversation history, newest first.
+
+    No cursor returns the latest page; before_id pages back in time and
+    after_id pages forward. Cursors are message ids.
+    """
+    user_id = request.args.get('user_id', 0, type=int)
+    friend_id = request.args.get('friend_id', 0, type=int)
+    before_id = request.args.get('before_id', type=int)
+    after_id = request.args.get('after_id', type=int)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+
+    if not user_id or not friend_id:
+        return jsonify({'error': 'user_id and friend_id are required'}), 400
+    if before_id and after_id:
+        return jsonify({'error': 'Use either before_id or after_id, not both'}), 400
+
+    query = Message.query.filter(conversation_filter(user_id, friend_id))
+    if after_id:
+        # Walk forward from the cursor, then present the page newest first
+        msgs = query.filter(Message.id > after_id).order_by(Message.id).limit(limit + 1).all()
+        has_more = len(msgs) > limit
+        msgs = msgs[:limit][::-1]
+    else:
+        if before_id:
+            query = query.filter(Message.id < before_id)
+        else:
+            mark_conversation_read(user_id, friend_id)
+        msgs = query.order_by(Message.id.desc()).limit(limit + 1).all()
+        has_more = len(msgs) > limit
+        msgs = msgs[:limit]
+
+    names = sender_names(msgs)
+    return jsonify({
+        'messages': [serialize_message(m, names.get(m.sender_id)) for m in msgs],
+        'has_more': has_more,
+        'next_before_id': msgs[-1].id if msgs else before_id,
+        'next_after_id': msgs[0].id if msgs else after_id
+    })
 
 @app.route('/api/messages/read', methods=['POST'])
 def mark_messages_read():
@@ -950,24 +2095,87 @@ def mark_messages_read():
     friend_id = data.get('friend_id')
     if not user_id or not friend_id:
         return jsonify({'error': 'Missing params'}), 400
-    now = datetime.now()
-    updated = Message.query.filter_by(
-        sender_id=friend_id, receiver_id=user_id, is_read=False
-    ).all()
-    for m in updated:
-        m.is_read = True
-        m.read_at = now
-    db.session.commit()
-    return jsonify({'marked_read': len(updated)})
+    return jsonify({'marked_read': mark_conversation_read(int(user_id), int(friend_id))})
 
 @app.route('/api/messages', methods=['POST'])
 def send_message():
     data = request.json
     msg = Message(sender_id=data['user_id'], receiver_id=data.get('friend_id'), content=data['text'])
     db.session.add(msg)
+    if msg.receiver_id:
+        db.session.flush()  # need msg.id and timestamp for the conversation row
+        record_message(msg)
     db.session.commit()
+
+    # Push to the recipient and to the sender's other open sessions
+    sender = User.query.get(msg.sender_id)
+    event = ChatEvent(msg.id, 'message', serialize_message(msg, sender.name if sender else None))
+    chat_broker.publish(msg.receiver_id, event)
+    chat_broker.publish(msg.sender_id, event)
     return jsonify({'message': 'Sent', 'id': msg.id})
 
+# Streams and files do not fit in a JSON envelope; batch must not nest
+BATCH_EXCLUDED = {'chat_events', 'export_users', 'export_turfs', 'uploaded_file', 'batch', 'static'}
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 10))
+# Copied from the batch request onto each entry, along with any X-Forwarded-*
+BATCH_FORWARDED_HEADERS = ('Accept-Language', 'User-Agent', 'X-Real-IP')
+
+def run_subrequest(path):
+    """Dispatch GET path (relative to /api) in-process and return (status, body).
+
+    The entry sees the batch's host and client headers, and carries its
+    request id, so URLs, language and logs match a standalone GET. It runs
+    the before/after_request hooks like one too; only error handling stays
+    here, so a failing entry becomes an {"error"} body instead of a page.
+    """
+    headers = {k: v for k, v in request.headers.items()
+               if k in BATCH_FORWARDED_HEADERS or k.startswith('X-Forwarded-')}
+    headers['Accept'] = JSON_MIMETYPE
+    if 'request_id' in g:
+        headers['X-Request-ID'] = g.request_id
+    started = g.get('request_started')
+    with app.test_request_context('/api/' + path.lstrip('/'), base_url=request.host_url,
+                                  method='GET', headers=headers):
+        g.pop('db_primary', None)       # each entry routes like a standalone GET
+        if request.url_rule is not None and request.url_rule.endpoint in BATCH_EXCLUDED:
+            return 400, {'error': 'Not available in a batch'}
+        try:
+            rv = app.preprocess_request()
+            response = app.finalize_request(app.dispatch_request() if rv is None else rv)
+        except HTTPException as e:
+            return e.code, {'error': e.description}
+        except Exception:
+            db.session.rollback()
+            log.exception('Batch entry failed', extra={'path': path})
+            return 500, {'error': 'Internal server error'}
+        finally:
+            # The entry shares the batch's g; keep the batch's own timing
+            if started is not None:
+                g.request_started = started
+        if response.is_streamed or response.mimetype != JSON_MIMETYPE:
+            response.close()
+            return 400, {'error': 'Not available in a batch'}
+        return response.status_code, app.json.loads(response.get_data())
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Run several GET routes in one round trip: {"requests": ["/turfs", "/announcements"]}."""
+    paths = (request.json or {}).get('requests')
+    if not isinstance(paths, list) or not paths:
+        return jsonify({'error': 'requests must be a non-empty list of paths'}), 400
+    if len(paths) > BATCH_MAX_REQUESTS:
+        return jsonify({'error': f'At most {BATCH_MAX_REQUESTS} requests per batch'}), 400
+    # Entries run one after another inside this request's app context, so they
+    # share its DB session (and pooled connection) instead of one each
+    responses = []
+    for path in paths:
+        if not isinstance(path, str):
+            responses.append({'status': 400, 'body': {'error': 'Path must be a string'}})
+            continue
+        status, body = run_subrequest(path)
+        responses.append({'status': status, 'body': body})
+    return jsonify({'responses': responses})
+
 if __name__ == '__main__':
     with app.app_context():
         # db.create_all()
@@ -0,0 +1,133 @@
+"""
+Slot availability engine.
+
+Each turf's day is split into fixed-length slots between its opening and
+closing hour. Occupancy for one (turf, day) is an int bitmap where bit i
+set means slot i is taken. Bitmaps are cached in-process; the booking and
+turf write routes invalidate the affected entries, and a short TTL bounds
+how stale a worker can be about bookings made through other workers.
+
+Cache misses are filled in bulk: the loader is called once with every
+missing turf id and date, so a multi-turf, multi-day query costs a single
+bookings query rather than one per turf-day.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+class Schedule(namedtuple('Schedule', 'open_hour close_hour slot_minutes')):
+    """Opening hours and slot length of a turf."""
+    __slots__ = ()
+
+    @classmethod
+    def for_turf(cls, turf):
+        return cls(
+            turf.open_hour if turf.open_hour is not None else 9,
+            turf.close_hour if turf.close_hour is not None else 23,
+            turf.slot_minutes or 60,
+        )
+
+    @property
+    def slot_count(self):
+        return max(0, (self.close_hour - self.open_hour) * 60 // self.slot_minutes)
+
+    def start_minute(self, index):
+        return self.open_hour * 60 + index * self.slot_minutes
+
+    def index_of(self, start_time):
+        """Slot index for a booking start time, or None if it isn't on the grid."""
+        offset = start_time.hour * 60 + start_time.minute - self.open_hour * 60
+        if offset < 0 or offset % self.slot_minutes:
+            return None
+        index = offset // self.slot_minutes
+        return index if index < self.slot_count else None
+
+    def bitmap(self, start_times):
+        bits = 0
+        for start in start_times:
+            index = self.index_of(start)
+            if index is not None:
+                bits |= 1 << index
+        return bits
+
+    def slots(self, bits):
+        """Slot dicts in the shape GET /api/turfs/<id>/slots has always returned."""
+        result = []
+        for index in range(self.slot_count):
+            start = self.start_minute(index)
+            end = start + self.slot_minutes
+            start_raw = f"{start // 60:02d}:{start % 60:02d}"
+            result.append({
+                'id': index,
+                'time': f"{start_raw} - {end // 60:02d}:{end % 60:02d}",
+                'available': not (bits >> index) & 1,
+                'start_raw': start_raw
+            })
+        return result
+
+    def free_starts(self, bits):
+        return [s['start_raw'] for s in self.slots(bits) if s['available']]
+
+
+class OccupancyCache:
+    """LRU + TTL cache of occupancy bitmaps per (turf_id, date)."""
+
+    def __init__(self, max_entries=50_000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (turf_id, date) -> (loaded_at, bitmap)
+        # Bumped by every invalidation; a load that raced with one is not cached
+        self._generation = 0
+
+    def get_many(self, schedules, dates, loader):
+        """{(turf_id, date): bitmap} for every turf in schedules and every date.
+
+        schedules maps turf_id -> Schedule. Misses are loaded with a single
+        loader(turf_ids, dates) call returning (turf_id, date, start_time) rows.
+        """
+        now = time.monotonic()
+        found, missing_turfs, missing_dates = {}, set(), set()
+        with self._lock:
+            generation = self._generation
+            for turf_id in schedules:
+                for day in dates:
+                    entry = self._entries.get((turf_id, day))
+                    if entry is not None and now - entry[0] < self.ttl:
+                        self._entries.move_to_end((turf_id, day))
+                        found[(turf_id, day)] = entry[1]
+                    else:
+                        missing_turfs.add(turf_id)
+                        missing_dates.add(day)
+
+        if missing_turfs:
+            starts = {}
+            for turf_id, day, start in loader(sorted(missing_turfs), sorted(missing_dates)):
+                starts.setdefault((turf_id, day), []).append(start)
+            with self._lock:
+                store = generation == self._generation
+                for turf_id in missing_turfs:
+                    schedule = schedules[turf_id]
+                    for day in missing_dates:
+                        key = (turf_id, day)
+                        bits = schedule.bitmap(starts.get(key, ()))
+                        if store:
+                            self._entries[key] = (now, bits)
+                            self._entries.move_to_end(key)
+                        found.setdefault(key, bits)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return found
+
+    def invalidate(self, turf_id, day):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop((turf_id, day), None)
+
+    def drop_turf(self, turf_id):
+        """Forget every day of a turf, e.g. after it is deleted or its hours change."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[0] == turf_id]:
+                del self._entries[key]
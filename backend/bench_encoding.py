@@ -0,0 +1,98 @@
+"""
+Benchmark: encode time and bytes on the wire for the large listing payloads.
+Builds payloads shaped like get_turfs, get_owner_bookings, get_all_users and
+get_messages, encodes them with Flask's stock JSON provider, FastJSONProvider
+(orjson) and MessagePack (when installed), and compresses each result with
+gzip and brotli (when installed). No database needed.
+Run: python bench_encoding.py [rows_per_payload]
+"""
+import gzip
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from encoding import FastJSONProvider, MSGPACK_MIMETYPE, brotli, msgpack
+
+CITIES = ('Chennai', 'Coimbatore', 'Madurai', 'Bengaluru', 'Kochi')
+SPORTS = ('football', 'cricket', 'badminton', 'tennis')
+
+
+def turfs(n):
+    return [{
+        'id': i, 'name': f'{random.choice(CITIES)} Arena {i}', 'sport_type': random.choice(SPORTS),
+        'city': random.choice(CITIES), 'location': f'{random.randint(1, 300)} Main Road, Sector {i % 40}',
+        'amenities': ['Parking', 'Floodlights', 'Changing Room'][:random.randint(0, 3)],
+        'price': float(random.randint(400, 2500)),
+        'image_url': f'http://localhost:5000/uploads/{random.getrandbits(80):020x}-card.jpg',
+        'image_srcset': {fmt: ', '.join(f'http://localhost:5000/uploads/{random.getrandbits(80):020x}-{v}.{fmt} {w}w'
+                                        for v, w in (('thumb', 160), ('card', 480), ('full', 1280)))
+                         for fmt in ('webp', 'jpg')},
+        'avg_rating': round(random.uniform(3, 5), 1), 'open_hour': 6, 'close_hour': 23, 'slot_minutes': 60,
+    } for i in range(n)]
+
+
+def bookings(n):
+    day = datetime(2026, 1, 1)
+    return {'items': [{
+        'id': i, 'turf_id': random.randint(1, 50), 'turf_name': f'Arena {random.randint(1, 50)}',
+        'user_name': f'Player {random.randint(1, 5000)}', 'user_uid': f'{random.randint(0, 999999):06d}',
+        'booking_date': (day + timedelta(days=i // 12)).strftime('%Y-%m-%d'),
+        'start_time': f'{6 + i % 12:02d}:00', 'end_time': f'{7 + i % 12:02d}:00',
+        'total_amount': float(random.randint(400, 2500)), 'status': 'confirmed',
+    } for i in range(n)], 'next_cursor': '2026-01-01,06:00:00,1'}
+
+
+def users(n):
+    return {'items': [{
+        'id': i, 'name': f'Player {i}', 'username': f'player{i}@example.com', 'role': 'user',
+        'uid': f'{random.randint(0, 999999):06d}', 'created_at': '2026-01-01 10:00',
+    } for i in range(n)], 'next_cursor': None}
+
+
+def messages(n):
+    start = datetime(2026, 1, 1, 18)
+    return [{
+        'id': i, 'sender_id': random.randint(1, 20), 'sender_name': f'Player {random.randint(1, 20)}',
+        'content': random.choice(('On my way', 'Who is bringing the ball?', 'Court 2 tonight at 8?',
+                                  'Booked it, see you all there')),
+        'created_at': (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'),
+    } for i in range(n)]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def bench(rows=500, repeat=20):
+    app = Flask('bench')
+    encoders = [('json', lambda obj, p=DefaultJSONProvider(app): p.dumps(obj).encode()),
+                ('orjson', FastJSONProvider(app).dumps_bytes)]
+    if msgpack is not None:
+        encoders.append(('msgpack', lambda obj, p=FastJSONProvider(app): p.encode(obj, MSGPACK_MIMETYPE)))
+    compressors = [('raw', lambda b: b), ('gzip-6', lambda b: gzip.compress(b, 6, mtime=0))]
+    if brotli is not None:
+        compressors.append(('br-5', lambda b: brotli.compress(b, quality=5)))
+
+    for name, payload in (('turfs', turfs(rows)), ('owner bookings', bookings(rows)),
+                          ('users', users(rows)), ('messages', messages(rows))):
+        print(f"{name} ({rows} rows)")
+        for label, encode in encoders:
+            encode_ms, body = timed(lambda: encode(payload), repeat)
+            cells = []
+            for codec, compress in compressors:
+                compress_ms, wire = timed(lambda: compress(body), repeat if codec == 'raw' else 3)
+                cells.append(f"{codec} {len(wire):>7} B" + (f" +{compress_ms:5.2f} ms" if codec != 'raw' else ''))
+            print(f"  {label:<8} encode {encode_ms:6.2f} ms   " + '   '.join(cells))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,45 @@
+"""
+Benchmark: database writes spent on presence, before and after coalescing.
+Simulates N clients sending a heartbeat every 30s (useHeartbeat.js) for a few
+minutes of virtual time and counts write statements/transactions issued.
+No database needed. Run: python bench_presence.py [num_users]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from presence import PresenceTracker
+
+HEARTBEAT_SECONDS = 30
+FLUSH_SECONDS = 30
+SIMULATED_SECONDS = 300
+
+def bench(num_users=20_000):
+    # Before: every heartbeat was an UPDATE + COMMIT on users
+    before_writes = num_users * SIMULATED_SECONDS // HEARTBEAT_SECONDS
+
+    batches = []
+    # Flushes are driven by hand below instead of by the background thread
+    tracker = PresenceTracker(lambda items: batches.append(len(items)), flush_interval=FLUSH_SECONDS,
+                              background=False)
+
+    start_clock = datetime.now()
+    start = time.perf_counter()
+    heartbeats = 0
+    for second in range(SIMULATED_SECONDS):
+        now = start_clock + timedelta(seconds=second)
+        # Clients are spread evenly across the heartbeat period
+        for user_id in range(second % HEARTBEAT_SECONDS, num_users, HEARTBEAT_SECONDS):
+            tracker.touch(user_id, now)
+            heartbeats += 1
+        if second % FLUSH_SECONDS == FLUSH_SECONDS - 1:
+            tracker.flush()
+    elapsed = time.perf_counter() - start
+
+    print(f"{num_users} users, {heartbeats} heartbeats over {SIMULATED_SECONDS}s")
+    print(f"before: {before_writes} write transactions ({before_writes / SIMULATED_SECONDS:.1f}/s)")
+    print(f"after:  {len(batches)} batched UPDATE transactions ({len(batches) / SIMULATED_SECONDS:.2f}/s), "
+          f"{sum(batches)} rows")
+    print(f"heartbeat handling cost: {elapsed / heartbeats * 1e6:.2f} us per heartbeat")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
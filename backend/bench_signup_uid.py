@@ -0,0 +1,74 @@
+"""
+Benchmark: UID generation cost at signup, random-probe loop vs UidAllocator.
+The keyspace is pre-filled to each ratio. The old loop draws random 6-digit
+codes and checks each one (a set stands in for the users table, and every
+check counts as one SELECT round trip). The allocator is fed by an in-memory
+reserve function, and each block it claims counts as one round trip.
+Throughput assumes ROUND_TRIP_MS per database round trip on top of the
+measured CPU time. No database needed.
+Run: python bench_signup_uid.py [signups_per_ratio]
+"""
+import random
+import secrets
+import sys
+import time
+from uids import UidAllocator
+
+WIDTH = 6
+KEYSPACE = 10 ** WIDTH
+ROUND_TRIP_MS = 0.5
+FILL_RATIOS = (0.5, 0.9, 0.99, 0.999)
+
+
+def bench_probe(taken, signups):
+    queries = 0
+    start = time.perf_counter()
+    for _ in range(signups):
+        while True:
+            uid = ''.join(random.choices('0123456789', k=WIDTH))
+            queries += 1
+            if uid not in taken:
+                taken.add(uid)
+                break
+    return time.perf_counter() - start, queries
+
+
+def bench_allocator(filled, signups, block_size=100):
+    key = secrets.token_bytes(32)
+    state = {'next': filled, 'calls': 0}
+
+    def reserve(count):
+        state['calls'] += 1
+        start = state['next']
+        granted = min(count, KEYSPACE - start)
+        state['next'] += granted
+        return key, WIDTH, start, granted
+
+    allocator = UidAllocator(reserve, block_size=block_size)
+    issued = set()
+    start = time.perf_counter()
+    for _ in range(signups):
+        issued.add(allocator.next_uid())
+    elapsed = time.perf_counter() - start
+    assert len(issued) == signups
+    return elapsed, state['calls']
+
+
+def report(label, elapsed, round_trips, signups):
+    total_ms = elapsed * 1000 + round_trips * ROUND_TRIP_MS
+    print(f"  {label:<10} {round_trips / signups:8.2f} round trips/signup  "
+          f"{elapsed / signups * 1e6:8.1f} us CPU  ~{signups / total_ms * 1000:9.0f} signups/s")
+
+
+def bench(signups=500):
+    for ratio in FILL_RATIOS:
+        filled = int(KEYSPACE * ratio)
+        n = min(signups, KEYSPACE - filled)
+        taken = {str(v).zfill(WIDTH) for v in random.sample(range(KEYSPACE), filled)}
+        print(f"fill {ratio:.1%} ({filled} codes taken), {n} signups")
+        report('probe', *bench_probe(taken, n), n)
+        report('allocator', *bench_allocator(filled, n), n)
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
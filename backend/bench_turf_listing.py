@@ -0,0 +1,48 @@
+"""
+Benchmark: GET /api/turfs latency and query count as the number of turfs grows.
+Rows are inserted inside a transaction that is rolled back, so the database is left untouched.
+Run: python bench_turf_listing.py
+"""
+import time
+from sqlalchemy import event
+from app import app, db, Turf, User, TurfRatingStats, turf_listing_query, serialize_turf
+
+SIZES = [10, 100, 400, 1000]
+REPEAT = 20
+
+def bench():
+    with app.app_context():
+        owner = User.query.filter_by(role='owner').first()
+        owner_id = owner.id if owner else None
+
+        statements = []
+        def count_query(*args):
+            statements.append(1)
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+
+        inserted = 0
+        try:
+            for size in SIZES:
+                while inserted < size:
+                    t = Turf(name=f'Bench Turf {inserted}', city='Benchpur', location='Bench Road',
+                             amenities='Parking,Water', price=1000, owner_id=owner_id, status='approved')
+                    db.session.add(t)
+                    db.session.flush()
+                    db.session.add(TurfRatingStats(turf_id=t.id, rating_count=3, rating_sum=12))
+                    inserted += 1
+                db.session.flush()
+
+                statements.clear()
+                start = time.perf_counter()
+                for _ in range(REPEAT):
+                    query = turf_listing_query().filter(Turf.city.ilike('%Benchpur%'))
+                    rows = [serialize_turf(t, c, s) for t, c, s in query.all()]
+                elapsed = (time.perf_counter() - start) / REPEAT * 1000
+                print(f"{size:>5} turfs: {elapsed:8.2f} ms/listing, "
+                      f"{len(statements) // REPEAT} queries/listing, {len(rows)} rows")
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_query)
+            db.session.rollback()
+
+if __name__ == "__main__":
+    bench()
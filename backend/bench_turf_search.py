@@ -0,0 +1,54 @@
+"""
+Benchmark: turf search index latency with a large synthetic catalogue.
+Runs entirely in memory, no database needed.
+Run: python bench_turf_search.py [num_turfs]
+"""
+import random
+import sys
+import time
+from collections import namedtuple
+from turf_search import TurfSearchIndex
+
+FakeTurf = namedtuple('FakeTurf', 'id name city location sport_type price amenities')
+
+CITIES = ['Mumbai', 'Pune', 'Bengaluru', 'Chennai', 'Hyderabad', 'Delhi', 'Kolkata', 'Ahmedabad',
+          'Jaipur', 'Lucknow', 'Nagpur', 'Indore', 'Bhopal', 'Surat', 'Kochi', 'Coimbatore']
+AREAS = ['Andheri', 'Bandra', 'Viman Nagar', 'Kothrud', 'Whitefield', 'Indiranagar', 'Adyar',
+         'Gachibowli', 'Saket', 'Salt Lake', 'Navrangpura', 'Malviya Nagar', 'Hazratganj']
+SPORTS = ['Cricket', 'Football', 'Tennis', 'Badminton', 'Basketball']
+AMENITIES = ['Parking', 'Water', 'Changing Room', 'Floodlights', 'Cafeteria', 'Washroom']
+
+QUERIES = [
+    dict(city='pune'),
+    dict(city='ben'),
+    dict(city='chenai'),
+    dict(city='mumbai', sport_type='football', sort='price_asc'),
+    dict(q='viman', max_price=1500),
+    dict(city='chennai', amenities=['parking', 'floodlights'], sort='price_desc'),
+    dict(sport_type='tennis', min_price=800, max_price=1200),
+]
+
+def build(n):
+    rnd = random.Random(42)
+    return [FakeTurf(
+        id=i, name=f'{rnd.choice(AREAS)} Arena {i}', city=rnd.choice(CITIES),
+        location=f'{rnd.choice(AREAS)} Road', sport_type=rnd.choice(SPORTS),
+        price=rnd.randrange(500, 3000, 50), amenities=','.join(rnd.sample(AMENITIES, 3))
+    ) for i in range(1, n + 1)]
+
+def bench(n=100_000, repeat=50):
+    turfs = build(n)
+    index = TurfSearchIndex(max_age=0)
+    start = time.perf_counter()
+    index.rebuild(turfs)
+    print(f"Indexed {n} turfs in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for params in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            total, ids = index.search(limit=20, **params)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f"{elapsed:8.2f} ms  {total:>6} hits  {params}")
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,103 @@
+"""
+Server-push delivery for chat.
+
+LocalBroker is an in-process, per-user fan-out hub: each open event stream
+subscribes a bounded queue, and publish() hands an event to every queue of
+that user. It only reaches clients connected to the same process, which is
+fine for a single node; a multi-node deployment needs a shared broker with
+the same publish/subscribe/unsubscribe methods.
+
+Resume-from-last-id does not depend on the broker: message events carry the
+message id as their SSE id, so a reconnecting client's Last-Event-ID is used
+to replay missed messages from the database before live events continue.
+"""
+import json
+import queue
+import threading
+from collections import namedtuple
+
+# id is None for events that must not move the client's resume cursor
+ChatEvent = namedtuple('ChatEvent', 'id type data')
+
+KEEPALIVE_SECONDS = 15
+RETRY_MS = 3000
+
+
+class LocalBroker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(q)
+        return q
+
+    def unsubscribe(self, user_id, q):
+        with self._lock:
+            subs = self._subscribers.get(user_id)
+            if subs is not None:
+                subs.discard(q)
+                if not subs:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        for q in subs:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: cut it loose, the client reconnects and
+                # replays from its Last-Event-ID.
+                self.unsubscribe(user_id, q)
+                _close(q)
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def _close(q):
+    # Make room for the end-of-stream marker. A publisher holding an older
+    # snapshot of the subscribers can refill the slot in between, so retry.
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(None)
+            return
+        except queue.Full:
+            continue
+
+
+def format_sse(event):
+    lines = []
+    if event.id is not None:
+        lines.append(f'id: {event.id}')
+    lines.append(f'event: {event.type}')
+    lines.append(f'data: {json.dumps(event.data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(broker, user_id, q, backlog=()):
+    """SSE generator for one subscription; it never touches the database."""
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        for event in backlog:
+            yield format_sse(event)
+        while True:
+            try:
+                event = q.get(timeout=KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                return
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(user_id, q)
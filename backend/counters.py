@@ -0,0 +1,80 @@
+"""
+Write-behind counter increments.
+
+The dashboard counters (stat_counters, daily_city_stats) are a handful of hot
+rows. Bumping them inside every signup or booking transaction would make all
+of those transactions queue on the same row locks. Instead, a request's
+increments are merged in here once its transaction has committed, and a
+background thread writes the summed deltas every flush_interval seconds as
+one short transaction. Like presence.py, this turns one write per request
+into a few per interval.
+
+Deltas not yet flushed are lost if the process dies. The counters can be
+recomputed from the raw tables at any time (rebuild_admin_stats).
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+
+log = logging.getLogger('turflio.counters')
+
+
+class CounterBuffer:
+    def __init__(self, flush, flush_interval=5, background=True):
+        self._flush = flush                  # callable(dict of key -> summed delta)
+        self.flush_interval = flush_interval
+        self.background = background         # False: the caller drives flush() itself
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def merge(self, deltas):
+        with self._lock:
+            self._pending.update(deltas)
+        if self._thread is None and self.background:
+            self._start()
+
+    def discard(self):
+        """Drop unflushed deltas, e.g. right before the counters are recomputed."""
+        with self._lock:
+            self._pending = Counter()
+
+    def flush(self):
+        """Write pending deltas; returns the number of keys flushed."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        pending = {k: v for k, v in pending.items() if v}
+        if not pending:
+            return 0
+        try:
+            self._flush(pending)
+        except Exception:
+            # Nothing was written (one transaction); fold the deltas back in
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return len(pending)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='counter-flush', daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                log.exception('Counter flush failed')
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            log.exception('Counter flush failed')
@@ -0,0 +1,89 @@
+"""
+Password hashing off the request threads.
+
+Hashing and verification are deliberately slow, so they run on a small
+dedicated pool instead of whichever request thread happened to receive a
+login. At most `workers` hashes run at once per process and at most
+`max_queue` more may wait; beyond that calls fail fast with
+CredentialsBusy, so a login storm is shed with 503s instead of tying up
+the threads the booking APIs need.
+
+Hashes use werkzeug's format. PASSWORD_HASH_METHOD sets the cost, e.g.
+'scrypt:32768:8:1' (default) or 'pbkdf2:sha256:600000'. Rows still holding
+a plaintext password from before hashing, or a hash made with an older
+method, are reported by needs_rehash() so login can upgrade them.
+"""
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+HASH_PREFIXES = ('scrypt:', 'pbkdf2:')
+
+
+class CredentialsBusy(Exception):
+    """Raised when the hashing queue is full or a job waited past the timeout."""
+
+
+def is_hashed(stored):
+    return bool(stored) and stored.startswith(HASH_PREFIXES)
+
+
+def hash_params(method):
+    """Algorithm and parameters of a werkzeug method string, defaults filled in.
+
+    'scrypt' and 'scrypt:32768:8:1' give the same tuple, as do 'pbkdf2' and
+    'pbkdf2:sha256:<default iterations>', because werkzeug stores the full
+    form in the hash whichever one it was asked for.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        return (name, *map(int, args)) if args else (name, 2 ** 15, 8, 1)
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return (name, hash_name, iterations)
+    raise ValueError(f'Unsupported password hash method {method!r}')
+
+
+class CredentialService:
+    def __init__(self, method='scrypt:32768:8:1', workers=2, max_queue=32, timeout=10):
+        self.method = method
+        self._params = hash_params(method)      # also rejects a bad method at startup
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='credentials')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise CredentialsBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise CredentialsBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored, password):
+        if not stored or not password:
+            return False
+        if not is_hashed(stored):
+            # Legacy plaintext row; no hashing work to offload
+            return hmac.compare_digest(stored.encode(), password.encode())
+        return self._run(check_password_hash, stored, password)
+
+    def needs_rehash(self, stored):
+        if not is_hashed(stored):
+            return True
+        try:
+            return hash_params(stored.split('$', 1)[0]) != self._params
+        except ValueError:
+            return True
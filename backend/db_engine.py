@@ -0,0 +1,121 @@
+"""
+Database engine configuration.
+
+Pool sizing, recycling and pre-ping come from the environment so each
+deployment can match its worker/thread count and MySQL's wait_timeout:
+
+    DB_POOL_SIZE (10)  DB_MAX_OVERFLOW (20)  DB_POOL_TIMEOUT (10 s)
+    DB_POOL_RECYCLE (280 s, below MySQL's default 8 h and common proxy idle cuts)
+    DB_POOL_PRE_PING (1)
+
+When a read replica is configured, RoutingSession sends the reads of GET/HEAD
+requests to it. Writes, SELECT ... FOR UPDATE and anything outside a request
+still use the primary, as do views marked @primary_db because they need to
+read their own writes. Replica reads can lag the primary by the replication
+delay.
+"""
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.pool import QueuePool
+
+REPLICA_BIND = 'replica'
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def _do_get(self):
+        stats = self.__dict__.get('wait_stats')
+        if stats is None:
+            stats = self.__dict__.setdefault('wait_stats', WaitStats())
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - start)
+        return conn
+
+
+class WaitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_ms_avg': round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+            }
+
+
+def engine_options():
+    """SQLALCHEMY_ENGINE_OPTIONS built from the DB_POOL_* variables."""
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 280)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', '1') == '1',
+    }
+
+
+def pool_status(engine):
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+        })
+    stats = pool.__dict__.get('wait_stats')
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
+
+
+def primary_db(view):
+    """Keep a GET view on the primary, e.g. when it writes or must see fresh rows."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_primary = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause):
+        if REPLICA_BIND not in self._db.engines or self._flushing:
+            return False
+        if getattr(clause, 'is_dml', False) or getattr(clause, '_for_update_arg', None) is not None:
+            return False
+        return (has_request_context() and request.method in ('GET', 'HEAD')
+                and not g.get('db_primary'))
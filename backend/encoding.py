@@ -0,0 +1,157 @@
+"""
+Response encoding: fast JSON, optional MessagePack, and compression.
+
+FastJSONProvider replaces Flask's json provider, so jsonify(), app.json and
+request.get_json() all go through orjson. Values orjson does not handle
+natively (Decimal, dates, dataclasses) fall back to Flask's own conversions,
+so payloads look the same as before, apart from key order (no longer sorted).
+Clients that send `Accept: application/msgpack` (the native app) get the same
+data packed as MessagePack if the msgpack package is installed.
+
+setup_compression(app) compresses buffered responses of a compressible type
+and at least COMPRESS_MIN_BYTES long. It uses brotli when the client accepts it
+and the brotli package is installed, and gzip otherwise. Streams (chat
+events, CSV exports) and files are left alone.
+
+Settings: JSON_ENCODER ('orjson' default, 'stdlib' for Flask's encoder),
+COMPRESS_MIN_BYTES (default 1024, 0 disables compression), COMPRESS_LEVEL
+(gzip 1-9, default 6), BROTLI_QUALITY (0-11, default 5).
+
+brotli and msgpack are optional: `pip install -r requirements-optional.txt`
+enables both, and nothing else needs configuring. Without them responses
+are gzip and JSON only.
+"""
+import gzip
+import os
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:                      # pragma: no cover - listed in requirements
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+COMPRESSIBLE = {JSON_MIMETYPE, MSGPACK_MIMETYPE, 'text/csv', 'text/plain'}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    compact = True
+    sort_keys = False        # dicts are built in a fixed order already
+
+    def __init__(self, app, use_orjson=True):
+        super().__init__(app)
+        self.use_orjson = use_orjson and orjson is not None
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+        return super().dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj):
+        if self.use_orjson:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options())
+        return super().dumps(obj).encode()
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def _orjson_options(self):
+        # Hand these to default() so they serialize the way Flask always has
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def negotiate(self):
+        """Mimetype to answer the current request with: JSON or MessagePack."""
+        if msgpack is None or not has_request_context():
+            return JSON_MIMETYPE
+        best = request.accept_mimetypes.best_match(
+            [JSON_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack'], default=JSON_MIMETYPE)
+        return JSON_MIMETYPE if best == JSON_MIMETYPE else MSGPACK_MIMETYPE
+
+    def encode(self, obj, mimetype=JSON_MIMETYPE):
+        if mimetype == MSGPACK_MIMETYPE:
+            return msgpack.packb(obj, default=self.default, datetime=False)
+        return self.dumps_bytes(obj)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        mimetype = self.negotiate()
+        response = self._app.response_class(self.encode(obj, mimetype), mimetype=mimetype)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
+
+
+class Compression:
+    """Coding choice and compression for responses; see setup_compression."""
+
+    def __init__(self, min_bytes, level, brotli_quality):
+        self.min_bytes = min_bytes
+        self.level = level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self, size):
+        """'br', 'gzip' or None for a body of `size` bytes in the current request."""
+        if size < self.min_bytes:
+            return None
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, body, coding):
+        if coding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+
+def setup_compression(app, min_bytes=None, level=None, brotli_quality=None):
+    """Compress responses after each request; returns the Compression, or None if disabled.
+
+    It is also kept as app.extensions['compression'] so routes that cache
+    their bodies can cache the compressed bytes too (see versioned_json).
+    """
+    min_bytes = int(os.getenv('COMPRESS_MIN_BYTES', 1024)) if min_bytes is None else min_bytes
+    level = int(os.getenv('COMPRESS_LEVEL', 6)) if level is None else level
+    brotli_quality = int(os.getenv('BROTLI_QUALITY', 5)) if brotli_quality is None else brotli_quality
+    if not min_bytes:
+        return None
+    compression = app.extensions['compression'] = Compression(min_bytes, level, brotli_quality)
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE):
+            return response
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        coding = compression.negotiate(len(body))
+        if coding is None:
+            return response
+        response.set_data(compression.compress(body, coding))
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # Same entity, different bytes: only weak comparison still holds
+            response.set_etag(etag, weak=True)
+        return response
+
+    return compression
@@ -0,0 +1,97 @@
+"""
+In-process friend graph.
+
+friends rows are stored one way (requester -> receiver); this keeps accepted
+friendships as a symmetric adjacency map of int sets, so mutual-friend counts
+are set intersections and "people you may know" is a count over friends of
+friends, with no SQL involved. The friend routes update it after each commit;
+like the search indexes, each worker reloads it every max_age seconds to
+pick up changes made through its siblings.
+"""
+import heapq
+import threading
+import time
+
+_EMPTY = frozenset()
+
+
+class FriendGraph:
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._loaded_at = None
+        self._adj = {}
+
+    def is_stale(self):
+        return self._loaded_at is None or (
+            self.max_age and time.monotonic() - self._loaded_at > self.max_age)
+
+    def rebuild(self, pairs):
+        """pairs: (user_id, friend_id) of every accepted friendship."""
+        adj = {}
+        for a, b in pairs:
+            adj.setdefault(a, set()).add(b)
+            adj.setdefault(b, set()).add(a)
+        with self._lock:
+            self._adj = adj
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, load):
+        """Rebuild from load() when stale, one caller at a time.
+
+        While a rebuild runs, other callers keep answering from the current
+        graph instead of each running the same full-table query; only the very
+        first load makes them wait.
+        """
+        if not self.is_stale():
+            return
+        if not self._rebuild_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self.is_stale():
+                self.rebuild(load())
+        finally:
+            self._rebuild_lock.release()
+
+    def add(self, a, b):
+        with self._lock:
+            self._adj.setdefault(a, set()).add(b)
+            self._adj.setdefault(b, set()).add(a)
+
+    def remove(self, a, b):
+        with self._lock:
+            self._adj.get(a, set()).discard(b)
+            self._adj.get(b, set()).discard(a)
+
+    def friends(self, user_id):
+        with self._lock:
+            return frozenset(self._adj.get(user_id, _EMPTY))
+
+    def mutual(self, a, b):
+        with self._lock:
+            return self._adj.get(a, _EMPTY) & self._adj.get(b, _EMPTY)
+
+    def mutual_counts(self, user_id, others):
+        """{other_id: number of friends in common} for each of others."""
+        with self._lock:
+            mine = self._adj.get(user_id, _EMPTY)
+            return {o: len(mine & self._adj.get(o, _EMPTY)) for o in others}
+
+    def suggestions(self, user_id, limit=10, exclude=()):
+        """[(user_id, mutual_count)] of friends-of-friends, most mutual friends first.
+
+        limit=None ranks every candidate.
+        """
+        counts = {}
+        with self._lock:
+            mine = self._adj.get(user_id, _EMPTY)
+            for friend in mine:
+                for candidate in self._adj.get(friend, _EMPTY):
+                    counts[candidate] = counts.get(candidate, 0) + 1
+        skip = set(exclude) | mine | {user_id}
+        candidates = ((c, n) for c, n in counts.items() if c not in skip)
+        rank = lambda item: (-item[1], item[0])
+        if limit is None:
+            return sorted(candidates, key=rank)
+        return heapq.nsmallest(limit, candidates, key=rank)
@@ -0,0 +1,160 @@
+"""
+Image pipeline for turf uploads.
+
+An upload is validated and decoded on the request thread (header and
+dimension checks first, then one full decode with the EXIF orientation
+applied), so a file that cannot be decoded is rejected before its URL is
+stored. A background pool then writes resized variants with the metadata
+dropped:
+
+    <key>-thumb.webp / .jpg   160px wide
+    <key>-card.webp  / .jpg   480px wide
+    <key>-full.webp  / .jpg   1280px wide
+
+key is derived from the SHA-256 of the uploaded bytes, so names never change
+for a given image and re-uploading the same photo reuses the existing files.
+URLs are known before the work finishes; the upload route serves a pending
+variant by waiting for its job (see ImagePipeline.wait).
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+log = logging.getLogger('turflio.images')
+
+VARIANTS = (('thumb', 160), ('card', 480), ('full', 1280))
+FORMATS = (('webp', 'WEBP', {'quality': 80, 'method': 4}),
+           ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}))
+ACCEPTED_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP'}
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+MAX_PIXELS = 40_000_000      # refuse decompression bombs before decoding
+
+_NAME = re.compile(r'^([0-9a-f]{20})-(thumb|card|full)\.(webp|jpg)$')
+
+
+def variant_name(key, variant, ext):
+    return f'{key}-{variant}.{ext}'
+
+
+def parse_name(name):
+    """(key, variant, ext) for a pipeline file name, or None for anything else."""
+    m = _NAME.match(name or '')
+    return m.groups() if m else None
+
+
+def validate(data):
+    """Check an upload is a supported, sane image; raises ValueError if not."""
+    if not data:
+        raise ValueError('Empty image upload')
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise ValueError(f'Image must be under {MAX_UPLOAD_BYTES // (1024 * 1024)} MB')
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            fmt, (width, height) = img.format, img.size
+            img.verify()
+    except Exception:
+        raise ValueError('File is not a valid image')
+    if fmt not in ACCEPTED_FORMATS:
+        raise ValueError('Image must be JPEG, PNG, GIF or WebP')
+    if width * height > MAX_PIXELS:
+        raise ValueError('Image dimensions are too large')
+
+
+def _flatten(img):
+    """RGB copy of img; transparency is composited onto white for JPEG."""
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    return img.convert('RGB')
+
+
+def decode(data):
+    """Upload (already validated) decoded to an upright RGB image; raises ValueError if it cannot be."""
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            src.seek(0)                              # first frame of a GIF
+            return _flatten(ImageOps.exif_transpose(src))
+    except Exception:
+        # verify() only checks structure; truncated or corrupt pixel data shows up here
+        raise ValueError('File is not a valid image')
+
+
+def render_variants(img, key, upload_dir):
+    """Write every variant of a decoded image; returns the file names written."""
+    written = []
+    for variant, width in VARIANTS:
+        resized = img
+        if img.width > width:
+            resized = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        for ext, fmt, options in FORMATS:
+            name = variant_name(key, variant, ext)
+            path = os.path.join(upload_dir, name)
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            # No exif= argument, so nothing from the source metadata is kept
+            resized.save(tmp, fmt, **options)
+            os.replace(tmp, path)                    # readers never see partial files
+            written.append(name)
+    return written
+
+
+class ImagePipeline:
+    def __init__(self, upload_dir, workers=2):
+        self.upload_dir = upload_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='images')
+        self._lock = threading.Lock()
+        self._pending = {}                           # key -> Future
+
+    def submit(self, data):
+        """Validate and decode an upload and queue its variants; returns the image key.
+
+        Raises ValueError if the upload is not an image that can be decoded.
+        """
+        validate(data)
+        key = hashlib.sha256(data).hexdigest()[:20]
+        if self._known(key):
+            return key
+        img = decode(data)
+        with self._lock:
+            if self._known(key):
+                return key
+            future = self._executor.submit(render_variants, img, key, self.upload_dir)
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._done(key, f))
+        return key
+
+    def _known(self, key):
+        last = os.path.join(self.upload_dir, variant_name(key, VARIANTS[-1][0], FORMATS[-1][0]))
+        return key in self._pending or os.path.exists(last)
+
+    def _done(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+        if future.exception() is not None:
+            log.error('Image processing failed', extra={'image_key': key},
+                      exc_info=future.exception())
+
+    def wait(self, name, timeout=10):
+        """Block until the job producing file `name` has finished, if one is queued."""
+        parsed = parse_name(name)
+        if parsed is None:
+            return
+        with self._lock:
+            future = self._pending.get(parsed[0])
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
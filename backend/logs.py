@@ -0,0 +1,114 @@
+"""
+Structured, non-blocking logging.
+
+Records are emitted as one JSON object per line. Request threads only put
+records on an in-memory queue (QueueHandler); a QueueListener thread does the
+formatting and the actual writes, so a slow disk or terminal never stalls a
+request. Every record made while handling a request carries that request's
+id, taken from an incoming X-Request-ID header or generated, and echoed back
+on the response.
+
+Settings: LOG_LEVEL (default INFO), LOG_FILE (absolute path; stdout only if
+unset), LOG_ACCESS (1 to log one line per request, default on).
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import secrets
+import sys
+import time
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        # Resolved on the emitting thread, where the request context lives
+        record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Resolve the message and traceback now, but leave them unformatted:
+        # the stock prepare() would flatten the traceback into msg.
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(app, name='turflio'):
+    """Route the app's logger through a queue to stdout (and LOG_FILE); returns it."""
+    logger = logging.getLogger(name)
+    if getattr(logger, '_listener', None):
+        return logger
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+    formatter = JsonFormatter()
+    targets = [logging.StreamHandler(sys.stdout)]
+    if os.getenv('LOG_FILE'):
+        targets.append(logging.handlers.WatchedFileHandler(os.getenv('LOG_FILE')))
+    for handler in targets:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(records, *targets, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger._listener = listener
+
+    access_log = os.getenv('LOG_ACCESS', '1') == '1'
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID') or secrets.token_hex(8)
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        if 'request_id' not in g:
+            return response
+        response.headers['X-Request-ID'] = g.request_id
+        if access_log:
+            logger.info('request', extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - g.request_started) * 1000, 1),
+            })
+        return response
+
+    return logger
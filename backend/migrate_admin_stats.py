@@ -0,0 +1,68 @@
+"""
+Migration: Create stat_counters + daily_city_stats and fill them from existing rows.
+Safe to re-run; it recomputes everything (same as POST /api/admin/stats/rebuild).
+Run: python migrate_admin_stats.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS stat_counters (
+        name VARCHAR(50) PRIMARY KEY,
+        value DECIMAL(14,2) NOT NULL DEFAULT 0
+    )
+""")
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_city_stats (
+        day DATE NOT NULL,
+        city VARCHAR(255) NOT NULL,
+        bookings INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, city)
+    )
+""")
+print("OK: stat_counters and daily_city_stats tables ready")
+
+# Same numbers as rebuild_admin_stats() in app.py
+cursor.execute("DELETE FROM stat_counters")
+cursor.execute("""
+    INSERT INTO stat_counters (name, value)
+    SELECT 'users', COUNT(*) FROM users WHERE role = 'user'
+    UNION ALL SELECT 'owners', COUNT(*) FROM users WHERE role = 'owner'
+    UNION ALL SELECT 'turfs', COUNT(*) FROM turfs
+    UNION ALL SELECT 'pending_turfs', COUNT(*) FROM turfs WHERE status = 'pending'
+    UNION ALL SELECT 'bookings', COUNT(*) FROM bookings
+    UNION ALL SELECT 'revenue', COALESCE(SUM(total_amount), 0) FROM bookings
+""")
+
+cursor.execute("DELETE FROM daily_city_stats")
+cursor.execute("""
+    INSERT INTO daily_city_stats (day, city, bookings, revenue)
+    SELECT DATE(b.created_at), t.city, COUNT(b.id), COALESCE(SUM(b.total_amount), 0)
+    FROM bookings b JOIN turfs t ON t.id = b.turf_id
+    WHERE b.created_at IS NOT NULL
+    GROUP BY DATE(b.created_at), t.city
+""")
+conn.commit()
+
+cursor.execute("SELECT name, value FROM stat_counters ORDER BY name")
+for name, value in cursor.fetchall():
+    print(f"{name}: {value}")
+cursor.execute("SELECT COUNT(*) FROM daily_city_stats")
+print(f"Daily series rows: {cursor.fetchone()[0]}")
+
+cursor.close()
+conn.close()
+print("\nMigration complete.")
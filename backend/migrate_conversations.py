@@ -0,0 +1,63 @@
+"""
+Migration: Create the conversations summary table and backfill it from messages.
+Run once: python migrate_conversations.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+# 1. Create conversations table
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS conversations (
+        user_low_id INT NOT NULL,
+        user_high_id INT NOT NULL,
+        last_message_id INT DEFAULT NULL,
+        last_timestamp DATETIME DEFAULT NULL,
+        unread_low INT NOT NULL DEFAULT 0,
+        unread_high INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_low_id, user_high_id),
+        FOREIGN KEY (user_low_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_high_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (last_message_id) REFERENCES messages(id) ON DELETE SET NULL
+    )
+""")
+print("OK: conversations table ready")
+
+# 2. Backfill one row per chat pair (re-running recomputes from messages)
+cursor.execute("""
+    INSERT INTO conversations (user_low_id, user_high_id, last_message_id, last_timestamp, unread_low, unread_high)
+    SELECT pair.low, pair.high, pair.last_id, m.timestamp, pair.unread_low, pair.unread_high
+    FROM (
+        SELECT LEAST(sender_id, receiver_id) AS low,
+               GREATEST(sender_id, receiver_id) AS high,
+               MAX(id) AS last_id,
+               SUM(is_read = 0 AND receiver_id < sender_id) AS unread_low,
+               SUM(is_read = 0 AND receiver_id > sender_id) AS unread_high
+        FROM messages
+        WHERE receiver_id IS NOT NULL AND sender_id IS NOT NULL
+        GROUP BY low, high
+    ) AS pair
+    JOIN messages m ON m.id = pair.last_id
+    ON DUPLICATE KEY UPDATE
+        last_message_id = VALUES(last_message_id),
+        last_timestamp = VALUES(last_timestamp),
+        unread_low = VALUES(unread_low),
+        unread_high = VALUES(unread_high)
+""")
+print(f"Backfilled {cursor.rowcount} conversation rows")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
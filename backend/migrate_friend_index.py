@@ -0,0 +1,42 @@
+"""
+Migration: Index on friends (friend_id, user_id) so lookups from the receiving side
+(incoming requests, friend lists) do not scan the table.
+Run once: python migrate_friend_index.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def index_exists(table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+for name, ddl in [
+    ('ix_friends_friend',
+     "CREATE INDEX ix_friends_friend ON friends (friend_id, user_id)"),
+]:
+    if not index_exists('friends', name):
+        cursor.execute(ddl)
+        print(f"Added: {name}")
+    else:
+        print(f"Skip: {name} already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,83 @@
+"""
+Migration: Replace colliding 'username-09AM' game ids with unique join codes.
+Old ids go into legacy_game_ids so links already shared keep working; each
+points at the booking the old lookup returned (the most recent one).
+Run once: python migrate_game_codes.py
+"""
+import pymysql
+import os
+import secrets
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Same format as new_game_code() in app.py; kept here so the migration does
+# not boot the app (pools, background threads) just to borrow it
+GAME_CODE_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+def new_game_code():
+    bits = secrets.randbits(40)
+    return ''.join(GAME_CODE_ALPHABET[(bits >> shift) & 31] for shift in range(35, -1, -5))
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def is_new_code(game_id):
+    return len(game_id) == 8 and all(c in GAME_CODE_ALPHABET for c in game_id)
+
+# 1. Mapping table for old ids
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS legacy_game_ids (
+        legacy_id VARCHAR(50) PRIMARY KEY,
+        booking_id INT NOT NULL,
+        FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE
+    )
+""")
+print("OK: legacy_game_ids table ready")
+
+# 2. Record old ids -> latest booking, then give every booking a fresh code
+cursor.execute("SELECT id, game_id FROM bookings WHERE game_id IS NOT NULL ORDER BY created_at, id")
+rows = [(booking_id, game_id) for booking_id, game_id in cursor.fetchall() if not is_new_code(game_id)]
+latest = {}
+for booking_id, game_id in rows:
+    latest[game_id] = booking_id   # later rows overwrite earlier ones
+cursor.executemany(
+    "INSERT IGNORE INTO legacy_game_ids (legacy_id, booking_id) VALUES (%s, %s)",
+    list(latest.items())
+)
+print(f"Mapped {len(latest)} legacy game ids")
+
+cursor.execute("SELECT game_id FROM bookings WHERE game_id IS NOT NULL")
+taken = {r[0] for r in cursor.fetchall()}
+cursor.execute("SELECT id FROM bookings WHERE game_id IS NULL")
+updates = []
+for booking_id in [b for b, _ in rows] + [r[0] for r in cursor.fetchall()]:
+    code = new_game_code()
+    while code in taken:
+        code = new_game_code()
+    taken.add(code)
+    updates.append((code, booking_id))
+cursor.executemany("UPDATE bookings SET game_id = %s WHERE id = %s", updates)
+print(f"Assigned {len(updates)} new game codes")
+
+# 3. Unique index so lookups are a single point query
+cursor.execute(
+    "SELECT COUNT(*) FROM information_schema.STATISTICS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'bookings' AND COLUMN_NAME = 'game_id' AND NON_UNIQUE = 0"
+)
+if cursor.fetchone()[0] == 0:
+    cursor.execute("CREATE UNIQUE INDEX ux_bookings_game_id ON bookings (game_id)")
+    print("Added: ux_bookings_game_id")
+else:
+    print("Skip: unique index on bookings.game_id already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
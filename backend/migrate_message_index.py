@@ -0,0 +1,33 @@
+"""
+Migration: Add composite index messages(sender_id, receiver_id, id) for keyset-paged chat history.
+Run once: python migrate_message_index.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+cursor.execute(
+    "SELECT COUNT(*) FROM information_schema.STATISTICS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'messages' AND INDEX_NAME = 'ix_messages_pair'"
+)
+if cursor.fetchone()[0] == 0:
+    cursor.execute("CREATE INDEX ix_messages_pair ON messages (sender_id, receiver_id, id)")
+    print("Added: ix_messages_pair")
+else:
+    print("Skip: ix_messages_pair already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,42 @@
+"""
+Migration: Composite index on bookings (turf_id, booking_date, start_time) used by
+the owner bookings endpoint.
+Run once: python migrate_owner_booking_index.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def index_exists(table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+for name, ddl in [
+    ('ix_bookings_turf_slot',
+     "CREATE INDEX ix_bookings_turf_slot ON bookings (turf_id, booking_date, start_time)"),
+]:
+    if not index_exists('bookings', name):
+        cursor.execute(ddl)
+        print(f"Added: {name}")
+    else:
+        print(f"Skip: {name} already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,77 @@
+"""
+Migration: Running split-payment totals on bookings + one payment per player per game.
+Run once: python migrate_payment_totals.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def column_exists(table, column):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column)
+    )
+    return cursor.fetchone()[0] > 0
+
+# 1. Counter columns on bookings
+if not column_exists('bookings', 'amount_collected'):
+    cursor.execute("ALTER TABLE bookings ADD COLUMN amount_collected DECIMAL(10,2) DEFAULT 0 AFTER num_players")
+    print("Added: bookings.amount_collected")
+else:
+    print("Skip: bookings.amount_collected already exists")
+
+if not column_exists('bookings', 'slots_filled'):
+    cursor.execute("ALTER TABLE bookings ADD COLUMN slots_filled INT DEFAULT 0 AFTER amount_collected")
+    print("Added: bookings.slots_filled")
+else:
+    print("Skip: bookings.slots_filled already exists")
+
+# 2. Duplicate payers from the old select-then-insert race keep their rows,
+#    renamed so the unique index can be built.
+cursor.execute("""
+    UPDATE game_payments gp
+    JOIN (
+        SELECT booking_id, player_name, MIN(id) AS keep_id
+        FROM game_payments GROUP BY booking_id, player_name HAVING COUNT(*) > 1
+    ) dup ON dup.booking_id = gp.booking_id AND dup.player_name = gp.player_name AND gp.id <> dup.keep_id
+    SET gp.player_name = CONCAT(gp.player_name, ' #', gp.id)
+""")
+print(f"Renamed {cursor.rowcount} duplicate payer rows")
+
+cursor.execute(
+    "SELECT COUNT(*) FROM information_schema.STATISTICS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'game_payments' AND INDEX_NAME = 'ux_game_payments_player'"
+)
+if cursor.fetchone()[0] == 0:
+    cursor.execute("CREATE UNIQUE INDEX ux_game_payments_player ON game_payments (booking_id, player_name)")
+    print("Added: ux_game_payments_player")
+else:
+    print("Skip: ux_game_payments_player already exists")
+
+# 3. Backfill the counters (re-running recomputes them)
+cursor.execute("""
+    UPDATE bookings b
+    LEFT JOIN (
+        SELECT booking_id, SUM(amount_paid) AS collected, COUNT(*) AS filled
+        FROM game_payments GROUP BY booking_id
+    ) p ON p.booking_id = b.id
+    SET b.amount_collected = COALESCE(p.collected, 0), b.slots_filled = COALESCE(p.filled, 0)
+""")
+print(f"Backfilled totals on {cursor.rowcount} bookings")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
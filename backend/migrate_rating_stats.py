@@ -0,0 +1,42 @@
+"""
+Migration: Create turf_rating_stats and backfill it from existing ratings.
+Run once: python migrate_rating_stats.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+# 1. Create turf_rating_stats table
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS turf_rating_stats (
+        turf_id INT PRIMARY KEY,
+        rating_count INT NOT NULL DEFAULT 0,
+        rating_sum INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (turf_id) REFERENCES turfs(id) ON DELETE CASCADE
+    )
+""")
+print("OK: turf_rating_stats table ready")
+
+# 2. Backfill (re-running recomputes the totals from scratch)
+cursor.execute("""
+    INSERT INTO turf_rating_stats (turf_id, rating_count, rating_sum)
+    SELECT turf_id, COUNT(*), SUM(stars) FROM ratings GROUP BY turf_id
+    ON DUPLICATE KEY UPDATE rating_count = VALUES(rating_count), rating_sum = VALUES(rating_sum)
+""")
+print(f"Backfilled stats for {cursor.rowcount} turf rows")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,33 @@
+"""
+Migration: Create resource_versions, the per-resource version counters behind the
+ETags on announcements and turf details. Rows are created by the first write
+to each resource (see bump_version).
+Run once: python migrate_resource_versions.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS resource_versions (
+        name VARCHAR(64) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    )
+""")
+print("OK: resource_versions table ready")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,41 @@
+"""
+Migration: Add indexes on turfs.city and turfs.sport_type used by turf search.
+Run once: python migrate_search_indexes.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def index_exists(table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+for name, ddl in [
+    ('ix_turfs_city', "CREATE INDEX ix_turfs_city ON turfs (city)"),
+    ('ix_turfs_sport_type', "CREATE INDEX ix_turfs_sport_type ON turfs (sport_type)"),
+]:
+    if not index_exists('turfs', name):
+        cursor.execute(ddl)
+        print(f"Added: {name}")
+    else:
+        print(f"Skip: {name} already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,52 @@
+"""
+Migration: Create slot_locks (one row per taken slot) and backfill it from confirmed bookings.
+Run once: python migrate_slot_locks.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+# 1. Create slot_locks table
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS slot_locks (
+        turf_id INT NOT NULL,
+        booking_date DATE NOT NULL,
+        start_time TIME NOT NULL,
+        user_id INT DEFAULT NULL,
+        booking_id INT DEFAULT NULL,
+        expires_at DATETIME DEFAULT NULL,
+        PRIMARY KEY (turf_id, booking_date, start_time),
+        FOREIGN KEY (turf_id) REFERENCES turfs(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+        FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE
+    )
+""")
+print("OK: slot_locks table ready")
+
+# 2. Lock every slot that already has a confirmed booking. Existing double
+#    bookings keep their earliest booking as the lock holder.
+cursor.execute("""
+    INSERT IGNORE INTO slot_locks (turf_id, booking_date, start_time, user_id, booking_id)
+    SELECT turf_id, booking_date, start_time, user_id, id
+    FROM bookings
+    WHERE status = 'confirmed' AND turf_id IS NOT NULL
+      AND booking_date IS NOT NULL AND start_time IS NOT NULL
+    ORDER BY id
+""")
+print(f"Backfilled {cursor.rowcount} slot locks")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,43 @@
+"""
+Migration: Add per-turf opening hours and slot length.
+Run once: python migrate_turf_hours.py
+"""
+import pymysql
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+def column_exists(table, column):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column)
+    )
+    return cursor.fetchone()[0] > 0
+
+# Defaults match the old hardcoded 9 AM - 11 PM, one-hour grid
+for column, ddl in [
+    ('open_hour', "ALTER TABLE turfs ADD COLUMN open_hour INT DEFAULT 9"),
+    ('close_hour', "ALTER TABLE turfs ADD COLUMN close_hour INT DEFAULT 23"),
+    ('slot_minutes', "ALTER TABLE turfs ADD COLUMN slot_minutes INT DEFAULT 60"),
+]:
+    if not column_exists('turfs', column):
+        cursor.execute(ddl)
+        print(f"Added: turfs.{column}")
+    else:
+        print(f"Skip: turfs.{column} already exists")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
@@ -0,0 +1,64 @@
+"""
+Migration: Create uid_sequence for the permutation-based UID allocator and widen
+users.uid so the sequence can move to longer codes once a width is used up,
+then create the sequence row (width 6, or 7 when older random 6-character
+codes exist), so signups never have to create it (see reserve_uid_block).
+Run once: python migrate_uid_sequence.py
+"""
+import pymysql
+import os
+import secrets
+from dotenv import load_dotenv
+
+load_dotenv()
+
+conn = pymysql.connect(
+    host=os.getenv('DB_HOST', 'localhost'),
+    user=os.getenv('DB_USER', 'root'),
+    password=os.getenv('DB_PASSWORD', 'root'),
+    database=os.getenv('DB_NAME', 'turn_app'),
+    charset='utf8mb4'
+)
+cursor = conn.cursor()
+
+# 1. Sequence table
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS uid_sequence (
+        id INT PRIMARY KEY,
+        width INT NOT NULL,
+        next_value BIGINT NOT NULL DEFAULT 0,
+        secret VARCHAR(64) NOT NULL
+    )
+""")
+print("OK: uid_sequence table ready")
+
+# 2. Widen users.uid (was CHAR(6))
+cursor.execute("""
+    SELECT CHARACTER_MAXIMUM_LENGTH FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users' AND COLUMN_NAME = 'uid'
+""")
+length = cursor.fetchone()[0]
+if length < 12:
+    cursor.execute("ALTER TABLE users MODIFY uid VARCHAR(12) DEFAULT NULL")
+    print(f"Widened: users.uid {length} -> 12")
+else:
+    print("Skip: users.uid already wide enough")
+
+# 3. Sequence row; same starting width as reserve_uid_block() in app.py
+cursor.execute("SELECT width, next_value FROM uid_sequence WHERE id = 1")
+row = cursor.fetchone()
+if row is None:
+    cursor.execute("SELECT COUNT(*) FROM users WHERE CHAR_LENGTH(uid) = 6")
+    width = 7 if cursor.fetchone()[0] else 6
+    cursor.execute(
+        "INSERT IGNORE INTO uid_sequence (id, width, next_value, secret) VALUES (1, %s, 0, %s)",
+        (width, secrets.token_hex(32))
+    )
+    print(f"Added: uid_sequence row at width {width}")
+else:
+    print(f"Skip: uid_sequence row exists (width {row[0]}, next {row[1]})")
+
+conn.commit()
+cursor.close()
+conn.close()
+print("\nMigration complete.")
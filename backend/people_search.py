@@ -0,0 +1,149 @@
+"""
+In-process people search.
+
+Names are indexed with the same token index as turf search (prefix lookup
+plus trigram fuzzy matching, see turf_search.TokenIndex); UIDs get a prefix
+index of their own, so typing the first digits of a friend's code finds
+them. Hits are ranked by score, then name, then id, and pages continue from
+an opaque cursor encoding the last hit's sort key, so results don't shift
+as the client pages.
+"""
+import base64
+import bisect
+import heapq
+import json
+import threading
+import time
+from collections import namedtuple
+
+from turf_search import TokenIndex, normalize, tokenize, EXACT, PREFIX
+
+PersonDoc = namedtuple('PersonDoc', 'id name display uid')
+
+UID_EXACT = 10          # a full code identifies one person
+UID_PREFIX = 4
+NAME_START_BONUS = 1    # query is a prefix of the whole name
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Sort key from a cursor; raises ValueError if it is malformed."""
+    try:
+        score, name, doc_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return (int(score), str(name), int(doc_id))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+class PeopleSearchIndex:
+    """Thread-safe name/UID index over users, refreshed every max_age seconds."""
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}
+        self._names = TokenIndex()
+        self._uids = TokenIndex()
+        self._order = []                 # sorted (name, id) for browsing without a query
+
+    def is_stale(self):
+        return self._loaded_at is None or (
+            self.max_age and time.monotonic() - self._loaded_at > self.max_age)
+
+    def rebuild(self, rows):
+        """rows: (id, name, uid) of every searchable user."""
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add(*row)
+            self._order.sort()
+            self._loaded_at = time.monotonic()
+
+    def upsert(self, user_id, name, uid):
+        with self._lock:
+            self._remove(user_id)
+            self._add(user_id, name, uid, keep_sorted=True)
+
+    def remove(self, user_id):
+        with self._lock:
+            self._remove(user_id)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, user_id, name, uid, keep_sorted=False):
+        doc = PersonDoc(user_id, normalize(name), name or '', uid or '')
+        self._docs[user_id] = doc
+        self._names.add(user_id, doc.name.split())
+        if doc.uid:
+            self._uids.add(user_id, [doc.uid.lower()])
+        if keep_sorted:
+            bisect.insort(self._order, (doc.name, user_id))
+        else:
+            self._order.append((doc.name, user_id))
+
+    def _remove(self, user_id):
+        doc = self._docs.pop(user_id, None)
+        if doc is None:
+            return
+        self._names.remove(user_id, doc.name.split())
+        if doc.uid:
+            self._uids.remove(user_id, [doc.uid.lower()])
+        i = bisect.bisect_left(self._order, (doc.name, user_id))
+        if i < len(self._order) and self._order[i] == (doc.name, user_id):
+            del self._order[i]
+
+    def _scores(self, terms, phrase):
+        result = None
+        for term in terms:
+            scores = self._names.match(term)
+            for doc_id, s in self._uids.match(term).items():
+                uid_score = UID_EXACT if s == EXACT else UID_PREFIX if s == PREFIX else 0
+                if uid_score > scores.get(doc_id, 0):
+                    scores[doc_id] = uid_score
+            if result is None:
+                result = scores
+            else:
+                result = {i: s + scores[i] for i, s in result.items() if i in scores}
+            if not result:
+                return {}
+        docs = self._docs
+        return {i: s + NAME_START_BONUS if docs[i].name.startswith(phrase) else s
+                for i, s in result.items()}
+
+    def search(self, q=None, cursor=None, limit=20, exclude=None):
+        """Return ([PersonDoc], next_cursor) for one page of matches.
+
+        cursor is a sort key from decode_cursor(); exclude is an id to skip
+        (the searcher themselves).
+        """
+        terms = tokenize(q)
+        with self._lock:
+            if not terms:
+                # Browse everyone alphabetically
+                start = 0
+                if cursor is not None:
+                    start = bisect.bisect_right(self._order, (cursor[1], cursor[2]))
+                page = []
+                for name, doc_id in self._order[start:]:
+                    if doc_id != exclude:
+                        page.append((0, name, doc_id))
+                        if len(page) > limit:
+                            break
+            else:
+                scores = self._scores(terms, ' '.join(terms))
+                docs = self._docs
+                keys = ((-s, docs[i].name, i) for i, s in scores.items() if i != exclude)
+                if cursor is not None:
+                    keys = (k for k in keys if k > cursor)
+                page = heapq.nsmallest(limit + 1, keys)
+            hits = [self._docs[doc_id] for _, _, doc_id in page[:limit]]
+        next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return hits, next_cursor
@@ -0,0 +1,101 @@
+"""
+Write-coalescing presence tracker.
+
+Heartbeats only record last_seen in memory; a background thread hands the
+accumulated timestamps to a flush callback in batches every flush_interval
+seconds, so the users table sees a few bulk UPDATEs instead of one
+transaction per heartbeat. Online checks take the newer of the in-memory
+value and the last_seen already loaded from the row, which keeps them
+correct across worker processes (at worst one flush interval behind).
+"""
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+
+log = logging.getLogger('turflio.presence')
+
+ONLINE_WINDOW = timedelta(minutes=2)
+
+
+class PresenceTracker:
+    def __init__(self, flush, flush_interval=30, batch_size=1000, background=True):
+        self._flush = flush                  # callable(list of (user_id, last_seen))
+        self.flush_interval = flush_interval
+        self.background = background         # False: the caller drives flush() itself
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._seen = {}                      # user_id -> last heartbeat
+        self._dirty = {}                     # user_id -> last_seen not yet written
+        self._thread = None
+        self._stop = threading.Event()
+
+    def touch(self, user_id, when=None):
+        when = when or datetime.now()
+        with self._lock:
+            self._seen[user_id] = when
+            self._dirty[user_id] = when
+        if self._thread is None and self.background:
+            self._start()
+
+    def forget(self, user_id):
+        """Drop any pending heartbeat, e.g. on logout."""
+        with self._lock:
+            self._seen.pop(user_id, None)
+            self._dirty.pop(user_id, None)
+
+    def last_seen(self, user_id, stored=None):
+        seen = self._seen.get(user_id)
+        if seen is None or (stored is not None and stored > seen):
+            return stored
+        return seen
+
+    def is_online(self, user_id, stored=None, now=None):
+        seen = self.last_seen(user_id, stored)
+        return seen is not None and seen > (now or datetime.now()) - ONLINE_WINDOW
+
+    def flush(self):
+        """Write pending heartbeats; returns the number of users flushed."""
+        with self._lock:
+            pending, self._dirty = self._dirty, {}
+            # Entries outside the online window no longer affect reads
+            cutoff = datetime.now() - ONLINE_WINDOW
+            self._seen = {u: t for u, t in self._seen.items() if t > cutoff}
+        items = list(pending.items())
+        failed, error = [], None
+        for i in range(0, len(items), self.batch_size):
+            batch = items[i:i + self.batch_size]
+            try:
+                self._flush(batch)
+            except Exception as e:
+                failed.extend(batch)
+                error = error or e
+        if error is not None:
+            # Put back only what was not written, unless a newer heartbeat replaced it
+            with self._lock:
+                for user_id, when in failed:
+                    self._dirty.setdefault(user_id, when)
+            raise error
+        return len(items)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='presence-flush', daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                log.exception('Presence flush failed')
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            log.exception('Presence flush failed')
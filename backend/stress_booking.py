@@ -0,0 +1,87 @@
+"""
+Concurrency check against a running server: many different users race for one
+slot, and exactly one of them may win each round.
+
+  1. holds:   every user asks to hold the slot at once; one 201, the rest 409
+  2. booking: every user books it at once; only the holder gets 201
+  3. expiry (--expiry): on a fresh slot one user holds it, the hold runs out,
+     then everyone else races for it; again exactly one 201. Start the server
+     with a short SLOT_HOLD_SECONDS and pass the same value as --hold-seconds.
+
+Run: python stress_booking.py <turf_id> <user_id,user_id,...> [--date YYYY-MM-DD]
+     [--start HH:MM] [--expiry --expiry-start HH:MM --hold-seconds N]
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+API_URL = 'http://localhost:5000/api'
+
+def post(path, payload):
+    req = urllib.request.Request(
+        f'{API_URL}{path}', data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 'error'
+
+def race(path, slot, user_ids):
+    """POST path for every user at once; returns {user_id: status}."""
+    payloads = [{**slot, 'user_id': u} for u in user_ids]
+    with ThreadPoolExecutor(max_workers=min(len(payloads), 64)) as pool:
+        return dict(zip(user_ids, pool.map(lambda p: post(path, p), payloads)))
+
+def check(label, statuses, winners=1):
+    counts = Counter(statuses.values())
+    ok = counts.get(201, 0) == winners and counts.get(409, 0) == len(statuses) - winners
+    print(f"{'PASS' if ok else 'FAIL'} {label}: {dict(counts)}")
+    return ok
+
+def stress(turf_id, user_ids, day, start, expiry_start=None, hold_seconds=None):
+    slot = {'turf_id': turf_id, 'date': day, 'start_time': start, 'amount': 1000, 'type': 'online'}
+    holds = race('/slots/hold', slot, user_ids)
+    ok = check(f"{len(user_ids)} users holding {day} {start}", holds)
+    holder = next((u for u, status in holds.items() if status == 201), None)
+
+    bookings = race('/book', slot, user_ids)
+    ok &= check(f"{len(user_ids)} users booking {day} {start}", bookings)
+    if holder is not None and bookings.get(holder) != 201:
+        print(f"FAIL the holder ({holder}) did not get the booking")
+        ok = False
+
+    if expiry_start:
+        slot = {**slot, 'start_time': expiry_start}
+        first, rest = user_ids[0], user_ids[1:]
+        ok &= check(f"user {first} holding {day} {expiry_start}", race('/slots/hold', slot, [first]))
+        ok &= check("others while the hold is live", race('/slots/hold', slot, rest), winners=0)
+        time.sleep(hold_seconds + 1)
+        ok &= check("others after the hold expired", race('/slots/hold', slot, rest))
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('turf_id', type=int)
+    parser.add_argument('user_ids', help='comma-separated ids of existing users (at least two)')
+    parser.add_argument('--date', default=str(date.today() + timedelta(days=365)))
+    parser.add_argument('--start', default='09:00')
+    parser.add_argument('--expiry', action='store_true')
+    parser.add_argument('--expiry-start', default='10:00')
+    parser.add_argument('--hold-seconds', type=int, default=5)
+    args = parser.parse_args()
+    users = [int(u) for u in args.user_ids.split(',')]
+    if len(users) < 2:
+        parser.error('need at least two users to race')
+    ok = stress(args.turf_id, users, args.date, args.start,
+                args.expiry_start if args.expiry else None, args.hold_seconds)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import mysql
+
+from app import conversation_upsert
+
+
+def test_set_order():
+    # MySQL evaluates ON DUPLICATE KEY UPDATE left to right against already-assigned columns, so
+    # last_timestamp must be assigned before last_message_id changes
+    stmt = conversation_upsert(1, 2, 10, datetime(2026, 1, 1, 18, 0))
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assignments = sql.split(' ON DUPLICATE KEY UPDATE ', 1)[1]
+    ts = assignments.index('last_timestamp = ')
+    msg_id = assignments.index('last_message_id = ')
+    assert ts < msg_id, assignments
+    print("Assignment order OK:", assignments)
+
+
+if __name__ == "__main__":
+    test_set_order()
@@ -0,0 +1,22 @@
+from datetime import time
+
+from app import parse_clock
+
+
+def test_parse_clock():
+    assert parse_clock('18:00') == time(18, 0)
+    assert parse_clock('9:00') == time(9, 0)
+    # AdminDashboard posts offline bookings as start_time + ":00"
+    assert parse_clock('9:00:00') == time(9, 0)
+    assert parse_clock('18:00:00') == time(18, 0)
+    for bad in ('', None, '25:00', '18', '18:00:00:00'):
+        try:
+            parse_clock(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f'accepted {bad!r}')
+    print("parse_clock OK")
+
+
+if __name__ == "__main__":
+    test_parse_clock()
@@ -0,0 +1,16 @@
+from availability import Schedule
+from app import parse_schedule
+
+
+def test_zero_open_hour():
+    # 0 is a real value (midnight), not a missing field
+    assert parse_schedule({'open_hour': 0, 'close_hour': 6}) == Schedule(0, 6, 60)
+    assert parse_schedule({'open_hour': '0', 'close_hour': '6'}) == Schedule(0, 6, 60)
+    # Empty form fields keep the current value
+    current = Schedule(8, 20, 60)
+    assert parse_schedule({'open_hour': '', 'slot_minutes': '30'}, current) == Schedule(8, 20, 30)
+    print("parse_schedule OK")
+
+
+if __name__ == "__main__":
+    test_zero_open_hour()
@@ -0,0 +1,25 @@
+from datetime import date, datetime, time
+
+from sqlalchemy.dialects import mysql
+
+from app import slot_claim
+
+
+def test_assignment_order():
+    # user_id must be decided first: the booking_id / expires_at assignments
+    # read the new user_id to learn whether the takeover happened
+    now = datetime(2026, 1, 1, 10, 0)
+    stmt = slot_claim(1, date(2026, 1, 2), time(9, 0), 5, None, now, now)
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assignments = sql.split(' ON DUPLICATE KEY UPDATE ', 1)[1]
+    order = [assignments.index(f'{col} = ') for col in ('user_id', 'booking_id', 'expires_at')]
+    assert order == sorted(order), assignments
+    # Only an expired hold or the caller's own hold can be taken over
+    takeover = assignments.split('user_id = ', 1)[1].split(' THEN ', 1)[0]
+    assert 'slot_locks.expires_at IS NOT NULL' in takeover
+    assert 'slot_locks.expires_at <' in takeover
+    print("slot claim OK")
+
+
+if __name__ == "__main__":
+    test_assignment_order()
@@ -0,0 +1,253 @@
+"""
+In-process search index for turfs.
+
+Replaces the leading-wildcard ILIKE scan on turfs.city with token postings:
+city and locality words are normalized, looked up by prefix through a sorted
+vocabulary, and fall back to trigram fuzzy matching for typos ("chenai").
+The index holds only ids and filter fields; app.py loads the page of rows.
+"""
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import namedtuple
+
+TurfDoc = namedtuple('TurfDoc', 'id name city terms sport price amenities')
+
+SORTS = ('relevance', 'price_asc', 'price_desc', 'name')
+
+# Scores per matched query term
+EXACT, PREFIX, FUZZY = 3, 2, 1
+FUZZY_THRESHOLD = 0.4
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation: 'Viman-Nagar ' -> 'viman nagar'."""
+    if not text:
+        return ''
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_NON_ALNUM.sub(' ', text.lower()).split())
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def trigrams(token):
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TokenIndex:
+    """token -> ids postings with prefix (bisect) and trigram fuzzy lookup."""
+
+    def __init__(self):
+        self.postings = {}
+        self.grams = {}
+        self._vocab = []
+        self._dirty = False
+
+    def add(self, doc_id, tokens):
+        for tok in tokens:
+            ids = self.postings.get(tok)
+            if ids is None:
+                ids = self.postings[tok] = set()
+                if not tok.isdigit():
+                    for g in trigrams(tok):
+                        self.grams.setdefault(g, set()).add(tok)
+                self._dirty = True
+            ids.add(doc_id)
+
+    def remove(self, doc_id, tokens):
+        for tok in tokens:
+            ids = self.postings.get(tok)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                del self.postings[tok]
+                for g in ([] if tok.isdigit() else trigrams(tok)):
+                    bucket = self.grams.get(g)
+                    if bucket is not None:
+                        bucket.discard(tok)
+                        if not bucket:
+                            del self.grams[g]
+                self._dirty = True
+
+    def _sorted_vocab(self):
+        if self._dirty:
+            self._vocab = sorted(self.postings)
+            self._dirty = False
+        return self._vocab
+
+    def match(self, term):
+        """Return {doc_id: score} for one query term."""
+        scores = {}
+        vocab = self._sorted_vocab()
+        i = bisect.bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            tok = vocab[i]
+            score = EXACT if tok == term else PREFIX
+            for doc_id in self.postings[tok]:
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+            i += 1
+        if scores or len(term) < 3:
+            return scores
+
+        term_grams = trigrams(term)
+        shared = {}
+        for g in term_grams:
+            for tok in self.grams.get(g, ()):
+                shared[tok] = shared.get(tok, 0) + 1
+        for tok, common in shared.items():
+            similarity = common / (len(term_grams) + len(trigrams(tok)) - common)
+            if similarity >= FUZZY_THRESHOLD:
+                for doc_id in self.postings[tok]:
+                    scores.setdefault(doc_id, FUZZY)
+        return scores
+
+
+class TurfSearchIndex:
+    """Thread-safe inverted index over turfs, kept in sync by the write routes."""
+
+    def __init__(self, max_age=300):
+        # Every worker process holds its own copy; max_age bounds how long a
+        # worker can miss writes handled by its siblings before reloading.
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}
+        self._city = TokenIndex()
+        self._text = TokenIndex()
+        self._by_sport = {}
+        self._price = {}
+        self._name = {}
+
+    def is_stale(self):
+        return self._loaded_at is None or (
+            self.max_age and time.monotonic() - self._loaded_at > self.max_age)
+
+    def rebuild(self, turfs):
+        with self._lock:
+            self._reset()
+            for t in turfs:
+                self._add(t)
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def upsert(self, turf):
+        with self._lock:
+            self._remove(turf.id)
+            self._add(turf)
+
+    def remove(self, turf_id):
+        with self._lock:
+            self._remove(turf_id)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, t):
+        name = normalize(t.name)
+        city = tokenize(t.city)
+        doc = TurfDoc(
+            id=t.id,
+            name=name,
+            city=city,
+            terms=frozenset(city + name.split() + tokenize(t.location)),
+            sport=normalize(t.sport_type),
+            price=float(t.price) if t.price else 0.0,
+            amenities=frozenset(normalize(a) for a in (t.amenities or '').split(',') if a.strip()),
+        )
+        self._docs[t.id] = doc
+        self._price[t.id] = doc.price
+        self._name[t.id] = doc.name
+        self._city.add(t.id, doc.city)
+        self._text.add(t.id, doc.terms)
+        self._by_sport.setdefault(doc.sport, set()).add(t.id)
+
+    def _remove(self, turf_id):
+        doc = self._docs.pop(turf_id, None)
+        if doc is None:
+            return
+        del self._price[turf_id], self._name[turf_id]
+        self._city.remove(turf_id, doc.city)
+        self._text.remove(turf_id, doc.terms)
+        sport_ids = self._by_sport.get(doc.sport)
+        if sport_ids is not None:
+            sport_ids.discard(turf_id)
+            if not sport_ids:
+                del self._by_sport[doc.sport]
+
+    @staticmethod
+    def _match_all(index, terms):
+        """AND across terms, summing per-term scores."""
+        result = None
+        for term in terms:
+            scores = index.match(term)
+            if result is None:
+                result = scores
+            else:
+                result = {i: s + scores[i] for i, s in result.items() if i in scores}
+            if not result:
+                return {}
+        return result or {}
+
+    def search(self, q=None, city=None, sport_type=None, min_price=None, max_price=None,
+               amenities=None, sort='relevance', offset=0, limit=20):
+        """Return (total, [turf ids]) for one page of matches."""
+        with self._lock:
+            scores = None
+            for index, text in ((self._city, city), (self._text, q)):
+                terms = tokenize(text)
+                if not terms:
+                    continue
+                matched = self._match_all(index, terms)
+                scores = matched if scores is None else {
+                    i: s + matched[i] for i, s in scores.items() if i in matched}
+
+            if sport_type:
+                sport_ids = self._by_sport.get(normalize(sport_type), set())
+                if scores is None:
+                    scores = dict.fromkeys(sport_ids, 0)
+                else:
+                    scores = {i: s for i, s in scores.items() if i in sport_ids}
+            if scores is None:
+                scores = dict.fromkeys(self._docs, 0)
+
+            # Filters and sorts work on plain id lists with C-level dict lookups
+            # as keys; building per-hit tuples dominated latency on large cities.
+            ids = sorted(scores)
+            price = self._price
+            if min_price is not None:
+                ids = [i for i in ids if price[i] >= min_price]
+            if max_price is not None:
+                ids = [i for i in ids if price[i] <= max_price]
+            wanted = {normalize(a) for a in (amenities or []) if a and a.strip()}
+            if wanted:
+                docs = self._docs
+                ids = [i for i in ids if wanted <= docs[i].amenities]
+
+            # list.sort is stable, so ties keep ascending id order
+            if sort == 'price_asc':
+                ids.sort(key=price.__getitem__)
+            elif sort == 'price_desc':
+                ids.sort(key=price.__getitem__, reverse=True)
+            elif sort == 'name':
+                ids.sort(key=self._name.__getitem__)
+            elif len(set(scores.values())) > 1:
+                ids.sort(key=scores.__getitem__, reverse=True)
+        return len(ids), ids[offset:offset + limit]
@@ -0,0 +1,74 @@
+"""
+Collision-free public user codes.
+
+A UID is the zero-padded decimal form of permute(n), where n comes from a
+database sequence and permute is a keyed Feistel permutation of
+[0, 10**width). A permutation never maps two inputs to the same output, so
+every n yields a distinct code without looking anything up. The codes still
+look random, so they reveal neither the signup order nor the user count.
+
+The sequence hands out blocks of n values, and each process spends its block
+from memory, so most signups cost no UID query at all. A process that exits
+leaves the rest of its block unused; that only leaves gaps. When a width's
+range is used up the sequence moves on to width + 1. Codes of different
+lengths are different strings, so widening keeps every earlier code unique.
+"""
+import hashlib
+import threading
+
+ROUNDS = 6
+
+
+class FeistelPermutation:
+    """Keyed bijection on [0, domain), via cycle-walking a balanced binary Feistel."""
+
+    def __init__(self, domain, key, rounds=ROUNDS):
+        bits = max(2, (domain - 1).bit_length())
+        bits += bits % 2                    # balanced halves; at most 4x the domain to walk
+        self.domain = domain
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        self.key = key
+        self.rounds = rounds
+
+    def _f(self, round_no, value):
+        digest = hashlib.blake2b(value.to_bytes(8, 'big'), digest_size=8,
+                                 key=self.key, salt=round_no.to_bytes(16, 'big')).digest()
+        return int.from_bytes(digest, 'big') & self.mask
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for round_no in range(self.rounds):
+            left, right = right, left ^ self._f(round_no, right)
+        return (left << self.half) | right
+
+    def __call__(self, n):
+        if not 0 <= n < self.domain:
+            raise ValueError('value outside the permutation domain')
+        x = self._encrypt(n)
+        while x >= self.domain:             # cycle-walk back into range
+            x = self._encrypt(x)
+        return x
+
+
+class UidAllocator:
+    def __init__(self, reserve, block_size=100):
+        # reserve(count) -> (key, width, start, granted) with 1 <= granted <= count
+        self._reserve = reserve
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._width = None
+        self._next = self._end = 0
+        self._permutations = {}
+
+    def next_uid(self):
+        with self._lock:
+            if self._next >= self._end:
+                key, self._width, self._next, granted = self._reserve(self.block_size)
+                self._end = self._next + granted
+                permute = self._permutations.get(self._width)
+                if permute is None or permute.key != key:
+                    permute = self._permutations[self._width] = FeistelPermutation(10 ** self._width, key)
+            n, width = self._next, self._width
+            self._next += 1
+        return str(self._permutations[width](n)).zfill(width)
@@ -0,0 +1,76 @@
+"""
+Version-stamped response caching.
+
+Rarely-changing resources ('announcements', 'turf:12') get a version number
+in the resource_versions table, bumped in the same transaction as every
+write to them. Reads use the version as a strong ETag, answer a matching
+If-None-Match with 304, and otherwise serve bytes cached per (resource,
+version, variant). The variant covers anything else that shapes the body,
+such as the content type or the origin baked into media URLs. A repeat read
+therefore neither queries the data nor serializes it again.
+
+Each worker reads a version at most once every `ttl` seconds, and its own
+writes invalidate it straight away, so writes made through other workers
+show up within ttl.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionTracker:
+    def __init__(self, load, ttl=2):
+        self._load = load                # callable(name) -> current version (int)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions = {}              # name -> (fetched_at, version)
+
+    def get(self, name):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(name)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        version = self._load(name)
+        with self._lock:
+            self._versions[name] = (now, version)
+        return version
+
+    def invalidate(self, names):
+        with self._lock:
+            for name in names:
+                self._versions.pop(name, None)
+
+
+class ResponseCache:
+    """LRU of serialized bodies; one entry per resource, tagged with its version."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()    # name -> (version, {variant: body})
+
+    def get(self, name, version, variant=None):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(name)
+            return entry[1].get(variant)
+
+    def put(self, name, version, body, variant=None):
+        with self._lock:
+            current = self._entries.get(name)
+            if current is not None and current[0] > version:
+                return                   # a newer body got there first
+            if current is None or current[0] < version:
+                current = self._entries[name] = (version, {})
+            current[1][variant] = body
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, names):
+        with self._lock:
+            for name in names:
+                self._entries.pop(name, None)
@@ -5,6 +5,13 @@ import { useNavigate } from 'react-router-dom';
 import { api, bookTurf } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
+// YYYY-MM-DD for the browser's local day (toISOString would give the UTC day)
+const localToday = () => {
+    const now = new Date();
+    return [now.getFullYear(), now.getMonth() + 1, now.getDate()]
+        .map(n => String(n).padStart(2, '0')).join('-');
+};
+
 const AdminDashboard = () => {
     const navigate = useNavigate();
     const { user, logout } = useAuth();
@@ -16,6 +23,9 @@ const AdminDashboard = () => {
     const [newBooking, setNewBooking] = useState({ date: '', time: '', start_time: '', turf_id: '' });
     const [isMaintenance, setIsMaintenance] = useState(false);
     const [myBookings, setMyBookings] = useState([]);
+    // Cursor for the next page of upcoming bookings; null once all are in
+    const [bookingsCursor, setBookingsCursor] = useState(null);
+    const [bookingSummary, setBookingSummary] = useState({ total_bookings: 0, total_revenue: 0 });
     const [activeTab, setActiveTab] = useState('dashboard');
 
     // Add Turf State
@@ -36,9 +46,9 @@ const AdminDashboard = () => {
     const [editLoading, setEditLoading] = useState(false);
 
     // Derived Stats
-    const totalRevenue = myBookings.reduce((acc, curr) => acc + (parseFloat(curr.amount) || 0), 0);
-    const totalBookings = myBookings.length;
-    const upcomingBookings = myBookings.filter(b => new Date(b.date) >= new Date());
+    const totalRevenue = bookingSummary.total_revenue;
+    const totalBookings = bookingSummary.total_bookings;
+    const upcomingBookings = myBookings;
 
     useEffect(() => {
         if (user) {
@@ -46,14 +56,22 @@ const AdminDashboard = () => {
         }
     }, [user]);
 
+    // Upcoming = from the owner's local today, soonest first
+    const upcomingUrl = (cursor) =>
+        `/owner/bookings?user_id=${user.id}&from=${localToday()}&order=asc&limit=100`
+        + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+
     const fetchMyData = async () => {
         setLoading(true);
         try {
-            const [bookingsRes, turfsRes] = await Promise.all([
-                api.get(`/owner/bookings?user_id=${user.id}`),
+            const [bookingsRes, summaryRes, turfsRes] = await Promise.all([
+                api.get(upcomingUrl()),
+                api.get(`/owner/bookings?user_id=${user.id}&summary=day`),
                 api.get(`/owner/turfs?user_id=${user.id}`)
             ]);
-            setMyBookings(bookingsRes.data);
+            setMyBookings(bookingsRes.data.items);
+            setBookingsCursor(bookingsRes.data.next_cursor);
+            setBookingSummary(summaryRes.data);
             setMyTurfs(turfsRes.data);
 
             // Set default turf if available
@@ -67,6 +85,16 @@ const AdminDashboard = () => {
         }
     };
 
+    const loadMoreBookings = async () => {
+        try {
+            const res = await api.get(upcomingUrl(bookingsCursor));
+            setMyBookings(prev => [...prev, ...res.data.items]);
+            setBookingsCursor(res.data.next_cursor);
+        } catch (error) {
+            console.error("Failed to fetch bookings", error);
+        }
+    };
+
     const handleLogout = () => {
         logout();
         navigate('/login');
@@ -277,7 +305,7 @@ const AdminDashboard = () => {
                     <div className="flex justify-between items-center" style={{ marginBottom: '16px' }}>
                         <h3 style={{ fontSize: '18px', fontWeight: '600' }}>Upcoming Schedule</h3>
                         <span style={{ fontSize: '12px', background: '#eee', padding: '4px 8px', borderRadius: '12px' }}>
-                            {upcomingBookings.length} Active
+                            {upcomingBookings.length}{bookingsCursor ? '+' : ''} Active
                         </span>
                     </div>
 
@@ -326,6 +354,11 @@ const AdminDashboard = () => {
                             </div>
                         ))}
                     </div>
+                    {!loading && bookingsCursor && (
+                        <button className="btn outline" style={{ marginTop: '16px', width: '100%' }} onClick={loadMoreBookings}>
+                            Load more bookings
+                        </button>
+                    )}
                 </div>
             )}
 
@@ -343,7 +376,7 @@ const AdminDashboard = () => {
                             <div key={turf.id} className="card" style={{ overflow: 'hidden', padding: 0 }}>
                                 <div style={{ height: '140px', background: '#eee', position: 'relative' }}>
                                     {turf.image_url ? (
-                                        <img src={turf.image_url} alt={turf.name} style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
+                                        <img src={turf.image_url} srcSet={turf.image_srcset?.jpg} sizes="280px" alt={turf.name} style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
                                     ) : (
                                         <div style={{ width: '100%', height: '100%', display: 'flex', alignItems: 'center', justifyContent: 'center', color: '#999' }}>
                                             No Image
@@ -454,7 +487,7 @@ const AdminDashboard = () => {
                                         required
                                         value={newBooking.date}
                                         onChange={(e) => setNewBooking({ ...newBooking, date: e.target.value })}
-                                        min={new Date().toISOString().split('T')[0]}
+                                        min={localToday()}
                                         style={{ width: '100%', padding: '10px', borderRadius: '8px', border: '1px solid #ddd' }}
                                     />
                                 </div>
@@ -1,7 +1,7 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
 import { Share2, Copy, Check, CheckCircle, Users, Wallet, ArrowRight } from 'lucide-react';
-import { bookTurf } from '../services/api';
+import { bookTurf, holdSlot } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 // ── Game Created success screen ──────────────────────────────────────────────
@@ -169,6 +169,17 @@ const BookingConfirm = () => {
     const [sharePerPlayer, setSharePerPlayer] = useState(0);
     const [loading, setLoading] = useState(false);
 
+    // Hold the slot while the user pays so nobody else can take it mid-checkout
+    useEffect(() => {
+        if (!state || !user) return;
+        holdSlot(user.id, state.turf.id, state.date, state.slot.start_raw).catch(error => {
+            if (error.response?.status === 409) {
+                alert('Sorry, this slot was just booked by someone else.');
+                navigate(-1);
+            }
+        });
+    }, []); // eslint-disable-line react-hooks/exhaustive-deps
+
     if (!state) return <div className="container">No booking details found.</div>;
     const { turf, date, slot, num_players } = state;
     const numPlayers = num_players || 1;
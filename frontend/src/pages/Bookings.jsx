@@ -85,7 +85,12 @@ const RatingModal = ({ booking, onClose, onSubmit }) => {
 
 const Bookings = () => {
     const { user } = useAuth();
-    const [bookings, setBookings] = useState([]);
+    // Upcoming and completed are paged separately; each cursor is null once its last page is in
+    const [upcoming, setUpcoming] = useState([]);
+    const [completed, setCompleted] = useState([]);
+    const [upcomingCursor, setUpcomingCursor] = useState(null);
+    const [completedCursor, setCompletedCursor] = useState(null);
+    const bookings = [...upcoming, ...completed];
     const [loading, setLoading] = useState(true);
     const [ratingBooking, setRatingBooking] = useState(null);
     const [ratedSuccess, setRatedSuccess] = useState(false);
@@ -100,12 +105,18 @@ const Bookings = () => {
             const pending = bookings.find(b => b.is_completed && b.rating === null && b.status === 'confirmed');
             if (pending) setRatingBooking(pending);
         }
-    }, [bookings]);
+    }, [upcoming, completed]);
 
     const fetchBookings = async () => {
         try {
-            const data = await getUserBookings(user.id);
-            setBookings(data);
+            const [upcomingPage, completedPage] = await Promise.all([
+                getUserBookings(user.id, { scope: 'upcoming' }),
+                getUserBookings(user.id, { scope: 'completed' })
+            ]);
+            setUpcoming(upcomingPage.items);
+            setUpcomingCursor(upcomingPage.next_cursor);
+            setCompleted(completedPage.items);
+            setCompletedCursor(completedPage.next_cursor);
         } catch (error) {
             console.error('Failed to load bookings');
         } finally {
@@ -113,6 +124,26 @@ const Bookings = () => {
         }
     };
 
+    const loadMoreUpcoming = async () => {
+        try {
+            const page = await getUserBookings(user.id, { scope: 'upcoming', cursor: upcomingCursor });
+            setUpcoming(prev => [...prev, ...page.items]);
+            setUpcomingCursor(page.next_cursor);
+        } catch (error) {
+            console.error('Failed to load bookings');
+        }
+    };
+
+    const loadMoreCompleted = async () => {
+        try {
+            const page = await getUserBookings(user.id, { scope: 'completed', cursor: completedCursor });
+            setCompleted(prev => [...prev, ...page.items]);
+            setCompletedCursor(page.next_cursor);
+        } catch (error) {
+            console.error('Failed to load bookings');
+        }
+    };
+
     const handleRatingSubmit = async (booking, stars, review) => {
         try {
             await api.post('/ratings', {
@@ -131,6 +162,48 @@ const Bookings = () => {
         }
     };
 
+    const renderBooking = booking => (
+        <div key={booking.id} className="card">
+            <div className="flex justify-between" style={{ marginBottom: '8px' }}>
+                <h3 style={{ fontSize: '16px', fontWeight: '600' }}>{booking.turf_name}</h3>
+                <span style={{
+                    padding: '4px 8px', borderRadius: '8px', fontSize: '12px',
+                    background: booking.status === 'confirmed' ? '#e8f5e9' : '#ffebee',
+                    color: booking.status === 'confirmed' ? 'green' : 'red'
+                }}>
+                    {booking.status}
+                </span>
+            </div>
+            <p className="text-secondary text-sm">{booking.date} at {booking.time?.substring(0, 5)}</p>
+            <p style={{ marginTop: '8px', fontWeight: 'bold' }}>₹{booking.amount}</p>
+
+            {/* Rating section */}
+            <div style={{ marginTop: '12px', paddingTop: '12px', borderTop: '1px solid #f0f0f0' }}>
+                {booking.rating !== null ? (
+                    <div style={{ display: 'flex', alignItems: 'center', gap: '4px' }}>
+                        {[1, 2, 3, 4, 5].map(s => (
+                            <Star key={s} size={16}
+                                fill={s <= booking.rating ? '#FFC107' : 'none'}
+                                color={s <= booking.rating ? '#FFC107' : '#ccc'}
+                            />
+                        ))}
+                        <span className="text-secondary text-sm" style={{ marginLeft: '4px' }}>Your rating</span>
+                    </div>
+                ) : booking.is_completed ? (
+                    <button
+                        className="btn outline"
+                        style={{ fontSize: '13px', padding: '6px 14px' }}
+                        onClick={() => setRatingBooking(booking)}
+                    >
+                        ⭐ Rate this session
+                    </button>
+                ) : (
+                    <span className="text-secondary text-sm">Upcoming — rating available after session</span>
+                )}
+            </div>
+        </div>
+    );
+
     if (loading) return <div className="container">Loading bookings...</div>;
 
     return (
@@ -151,47 +224,18 @@ const Bookings = () => {
                 <p className="text-secondary">No bookings found. Book a turf today!</p>
             ) : (
                 <div style={{ display: 'grid', gap: '16px' }}>
-                    {bookings.map(booking => (
-                        <div key={booking.id} className="card">
-                            <div className="flex justify-between" style={{ marginBottom: '8px' }}>
-                                <h3 style={{ fontSize: '16px', fontWeight: '600' }}>{booking.turf_name}</h3>
-                                <span style={{
-                                    padding: '4px 8px', borderRadius: '8px', fontSize: '12px',
-                                    background: booking.status === 'confirmed' ? '#e8f5e9' : '#ffebee',
-                                    color: booking.status === 'confirmed' ? 'green' : 'red'
-                                }}>
-                                    {booking.status}
-                                </span>
-                            </div>
-                            <p className="text-secondary text-sm">{booking.date} at {booking.time?.substring(0, 5)}</p>
-                            <p style={{ marginTop: '8px', fontWeight: 'bold' }}>₹{booking.amount}</p>
-
-                            {/* Rating section */}
-                            <div style={{ marginTop: '12px', paddingTop: '12px', borderTop: '1px solid #f0f0f0' }}>
-                                {booking.rating !== null ? (
-                                    <div style={{ display: 'flex', alignItems: 'center', gap: '4px' }}>
-                                        {[1, 2, 3, 4, 5].map(s => (
-                                            <Star key={s} size={16}
-                                                fill={s <= booking.rating ? '#FFC107' : 'none'}
-                                                color={s <= booking.rating ? '#FFC107' : '#ccc'}
-                                            />
-                                        ))}
-                                        <span className="text-secondary text-sm" style={{ marginLeft: '4px' }}>Your rating</span>
-                                    </div>
-                                ) : booking.is_completed ? (
-                                    <button
-                                        className="btn outline"
-                                        style={{ fontSize: '13px', padding: '6px 14px' }}
-                                        onClick={() => setRatingBooking(booking)}
-                                    >
-                                        ⭐ Rate this session
-                                    </button>
-                                ) : (
-                                    <span className="text-secondary text-sm">Upcoming — rating available after session</span>
-                                )}
-                            </div>
-                        </div>
-                    ))}
+                    {upcoming.map(renderBooking)}
+                    {upcomingCursor && (
+                        <button className="btn outline" onClick={loadMoreUpcoming}>
+                            Load more upcoming bookings
+                        </button>
+                    )}
+                    {completed.map(renderBooking)}
+                    {completedCursor && (
+                        <button className="btn outline" onClick={loadMoreCompleted}>
+                            Load older bookings
+                        </button>
+                    )}
                 </div>
             )}
 
@@ -2,7 +2,7 @@ import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { Send, ArrowLeft, Check } from 'lucide-react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
-import { getMessages, sendMessage, getUser } from '../services/api';
+import { getMessageHistory, sendMessage, getUser, openChatEvents } from '../services/api';
 
 const avatarGradients = [
     'linear-gradient(135deg, #42a5f5, #1565c0)',
@@ -62,8 +62,14 @@ const Chat = () => {
     const [input, setInput] = useState('');
     const [friend, setFriend] = useState(null);
     const [sending, setSending] = useState(false);
+    // Cursor for the next older page (next_before_id); null once the start is reached
+    const [olderCursor, setOlderCursor] = useState(null);
+    const [loadingOlder, setLoadingOlder] = useState(false);
+    const keepScrollRef = useRef(false);
     const messagesEndRef = useRef(null);
     const inputRef = useRef(null);
+    // Ids of messages sent from this tab; their push echo is already handled by handleSend
+    const sentIdsRef = useRef(new Set());
 
     const scrollToBottom = () => {
         messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -77,22 +83,66 @@ const Chat = () => {
     const loadMessages = useCallback(async () => {
         try {
             if (!friendId || !user) return;
-            const data = await getMessages(user.id, friendId);
-            // Backend auto-marks messages as read when fetched
-            setMessages(prev => JSON.stringify(prev) !== JSON.stringify(data) ? data : prev);
+            // Latest page (newest first); the backend marks the friend's messages read
+            const page = await getMessageHistory(user.id, friendId, { limit: 50 });
+            const latest = [...page.messages].reverse();
+            const oldestInPage = latest.length ? latest[0].id : Infinity;
+            setMessages(prev => {
+                const known = prev.filter(m => !m._temp);
+                // First load, or more than a page arrived since the last refresh
+                // (the two would not join up): start over from this page
+                if (!known.length || (page.has_more && !known.some(m => m.id >= oldestInPage))) {
+                    setOlderCursor(page.has_more ? page.next_before_id : null);
+                    return latest;
+                }
+                const next = [...known.filter(m => m.id < oldestInPage), ...latest];
+                return JSON.stringify(prev) !== JSON.stringify(next) ? next : prev;
+            });
         } catch (e) { console.error(e); }
     }, [friendId, user]);
 
+    const loadOlder = async () => {
+        if (!olderCursor || loadingOlder) return;
+        setLoadingOlder(true);
+        try {
+            const page = await getMessageHistory(user.id, friendId, { beforeId: olderCursor, limit: 50 });
+            keepScrollRef.current = true;
+            setMessages(prev => [...[...page.messages].reverse(), ...prev]);
+            setOlderCursor(page.has_more ? page.next_before_id : null);
+        } catch (e) { console.error(e); }
+        finally { setLoadingOlder(false); }
+    };
+
     useEffect(() => {
         if (!friendId) { navigate('/chat'); return; }
+        setMessages([]);
+        setOlderCursor(null);
         loadFriend();
         loadMessages();
-        // Poll every 3s — this also auto-marks incoming as read each time
-        const interval = setInterval(loadMessages, 3000);
-        return () => clearInterval(interval);
-    }, [friendId, loadFriend, loadMessages, navigate]);
+        if (!user) return;
+        // Server pushes new messages and read receipts — refetch only when this chat changes
+        const events = openChatEvents(user.id);
+        const onEvent = (e) => {
+            const data = JSON.parse(e.data);
+            const fromFriend = String(data.sender_id) === String(friendId) || String(data.reader_id) === String(friendId);
+            // Sent by this user from another device or tab
+            const fromMeElsewhere = String(data.sender_id) === String(user.id)
+                && String(data.receiver_id) === String(friendId)
+                && !sentIdsRef.current.has(data.id);
+            if (fromFriend || fromMeElsewhere) {
+                loadMessages();
+            }
+        };
+        events.addEventListener('message', onEvent);
+        events.addEventListener('read', onEvent);
+        return () => events.close();
+    }, [friendId, user, loadFriend, loadMessages, navigate]);
 
-    useEffect(() => { scrollToBottom(); }, [messages]);
+    useEffect(() => {
+        // Prepending older history should not jump to the newest message
+        if (keepScrollRef.current) { keepScrollRef.current = false; return; }
+        scrollToBottom();
+    }, [messages]);
 
     const handleSend = async (e) => {
         e.preventDefault();
@@ -111,7 +161,8 @@ const Chat = () => {
         }]);
         setInput('');
         try {
-            await sendMessage(user.id, friendId, text);
+            const sent = await sendMessage(user.id, friendId, text);
+            sentIdsRef.current.add(sent.id);
             await loadMessages();
         } catch (e) { console.error(e); }
         finally { setSending(false); inputRef.current?.focus(); }
@@ -186,6 +237,20 @@ const Chat = () => {
                 padding: '12px 12px 8px',
                 display: 'flex', flexDirection: 'column', gap: '3px'
             }}>
+                {olderCursor && (
+                    <button
+                        onClick={loadOlder}
+                        disabled={loadingOlder}
+                        style={{
+                            alignSelf: 'center', background: 'white', border: '1px solid #e0e0e0',
+                            borderRadius: '16px', padding: '6px 14px', fontSize: '12px',
+                            color: 'var(--text-secondary)', cursor: 'pointer', marginBottom: '8px'
+                        }}
+                    >
+                        {loadingOlder ? 'Loading...' : 'Load earlier messages'}
+                    </button>
+                )}
+
                 {messages.length === 0 && (
                     <div style={{ flex: 1, display: 'flex', flexDirection: 'column', alignItems: 'center', justifyContent: 'center', paddingTop: '40px' }}>
                         <div style={{
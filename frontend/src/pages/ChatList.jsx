@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Search, MessageCircle, CheckCheck } from 'lucide-react';
-import { getFriends } from '../services/api';
+import { getFriends, openChatEvents } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 const avatarGradients = [
@@ -38,9 +38,13 @@ const ChatList = () => {
 
     useEffect(() => {
         loadFriends();
-        const interval = setInterval(loadFriends, 5000);
-        return () => clearInterval(interval);
-    }, [loadFriends]);
+        if (!user) return;
+        // Refresh last message / unread counts when the server pushes a chat event
+        const events = openChatEvents(user.id);
+        events.addEventListener('message', loadFriends);
+        events.addEventListener('read', loadFriends);
+        return () => events.close();
+    }, [user, loadFriends]);
 
     const totalUnread = friends.reduce((sum, f) => sum + (f.unread_count || 0), 0);
     const filtered = friends.filter(f => f.name.toLowerCase().includes(search.toLowerCase()));
@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Search, UserPlus, Check, X, Circle, MessageCircle } from 'lucide-react';
-import { getFriends, getFriendRequests, searchUsers, sendFriendRequest } from '../services/api';
+import { getFriends, getFriendRequests, searchUsers, sendFriendRequest, getFriendSuggestions } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 import { api } from '../services/api';
 
@@ -15,6 +15,7 @@ const Friends = () => {
     const [searchQuery, setSearchQuery] = useState('');
     const [tab, setTab] = useState('all'); // 'all' | 'friends' | 'requests'
     const [sentRequests, setSentRequests] = useState(new Set());
+    const [suggestions, setSuggestions] = useState([]);
 
     const loadFriends = useCallback(async () => {
         if (!user) return;
@@ -35,10 +36,16 @@ const Friends = () => {
     const loadAllUsers = useCallback(async (q = '') => {
         if (!user) return;
         try {
-            // Search with empty string returns all users (or use a broad search)
-            const results = await searchUsers(q || 'a');
-            // Filter out self
-            setAllUsers(results.filter(u => u.id !== user.id));
+            // Empty query lists everyone alphabetically; the server leaves out self
+            const page = await searchUsers(q, { userId: user.id, limit: 50 });
+            setAllUsers(page.items);
+        } catch (e) { console.error(e); }
+    }, [user]);
+
+    const loadSuggestions = useCallback(async () => {
+        if (!user) return;
+        try {
+            setSuggestions(await getFriendSuggestions(user.id));
         } catch (e) { console.error(e); }
     }, [user]);
 
@@ -46,17 +53,13 @@ const Friends = () => {
         loadFriends();
         loadRequests();
         loadAllUsers('');
-    }, [loadFriends, loadRequests, loadAllUsers]);
+        loadSuggestions();
+    }, [loadFriends, loadRequests, loadAllUsers, loadSuggestions]);
 
     const handleSearch = async (e) => {
         const q = e.target.value;
         setSearchQuery(q);
-        if (q.length > 0) {
-            const results = await searchUsers(q);
-            setAllUsers(results.filter(u => u.id !== user.id));
-        } else {
-            loadAllUsers('');
-        }
+        loadAllUsers(q);
     };
 
     const sendRequest = async (friendId) => {
@@ -81,7 +84,7 @@ const Friends = () => {
     const friendIds = new Set(friends.map(f => f.id));
 
     // Displayed users for "All People" tab
-    const displayedUsers = allUsers.filter(u => !friendIds.has(u.id));
+    const displayedUsers = allUsers.filter(u => u.friendship !== 'friends' && !friendIds.has(u.id));
 
     const tabs = [
         { key: 'all', label: 'All People' },
@@ -134,13 +137,42 @@ const Friends = () => {
                 {/* ALL PEOPLE tab */}
                 {tab === 'all' && (
                     <div>
+                        {!searchQuery && suggestions.length > 0 && (
+                            <div style={{ background: 'white', padding: '12px 16px', marginBottom: '8px' }}>
+                                <div style={{ fontWeight: '700', fontSize: '13px', marginBottom: '10px' }}>People you may know</div>
+                                <div style={{ display: 'flex', gap: '10px', overflowX: 'auto' }}>
+                                    {suggestions.map(s => (
+                                        <div key={s.id} style={{
+                                            minWidth: '120px', padding: '10px', borderRadius: '12px',
+                                            border: '1px solid #f0f0f0', textAlign: 'center'
+                                        }}>
+                                            <div style={{ fontWeight: '600', fontSize: '14px' }}>{s.name}</div>
+                                            <div style={{ fontSize: '11px', color: 'var(--text-secondary)', margin: '4px 0 8px' }}>
+                                                {s.mutual_friends} mutual friend{s.mutual_friends === 1 ? '' : 's'}
+                                            </div>
+                                            <button
+                                                onClick={() => !sentRequests.has(s.id) && sendRequest(s.id)}
+                                                style={{
+                                                    padding: '6px 12px', borderRadius: '16px', border: 'none',
+                                                    background: sentRequests.has(s.id) ? '#e8f5e9' : 'var(--primary-color)',
+                                                    color: sentRequests.has(s.id) ? '#4CAF50' : 'white',
+                                                    fontWeight: '600', fontSize: '12px', cursor: 'pointer'
+                                                }}
+                                            >
+                                                {sentRequests.has(s.id) ? 'Sent' : 'Add'}
+                                            </button>
+                                        </div>
+                                    ))}
+                                </div>
+                            </div>
+                        )}
                         {displayedUsers.length === 0 && (
                             <p className="text-secondary text-sm" style={{ textAlign: 'center', marginTop: '40px' }}>
                                 {searchQuery ? 'No users found' : 'No other users yet'}
                             </p>
                         )}
                         {displayedUsers.map(u => {
-                            const isSent = sentRequests.has(u.id);
+                            const isSent = sentRequests.has(u.id) || u.friendship === 'request_sent';
                             return (
                                 <div key={u.id} style={{
                                     display: 'flex', alignItems: 'center', gap: '12px',
@@ -159,7 +191,21 @@ const Friends = () => {
                                     <div style={{ flex: 1 }}>
                                         <div style={{ fontWeight: '600', fontSize: '15px' }}>{u.name}</div>
                                         {u.uid && <div style={{ fontSize: '12px', color: 'var(--text-secondary)', fontFamily: 'monospace' }}>UID: {u.uid}</div>}
+                                        {u.mutual_friends > 0 && <div style={{ fontSize: '12px', color: 'var(--text-secondary)' }}>{u.mutual_friends} mutual friend{u.mutual_friends === 1 ? '' : 's'}</div>}
                                     </div>
+                                    {u.friendship === 'request_received' ? (
+                                        <button
+                                            onClick={() => handleResponse(u.id, 'accept').then(() => loadAllUsers(searchQuery))}
+                                            style={{
+                                                display: 'flex', alignItems: 'center', gap: '6px',
+                                                padding: '8px 14px', borderRadius: '20px', border: 'none',
+                                                background: 'var(--primary-color)', color: 'white',
+                                                fontWeight: '600', fontSize: '13px', cursor: 'pointer'
+                                            }}
+                                        >
+                                            <Check size={14} /> Accept
+                                        </button>
+                                    ) : (
                                     <button
                                         onClick={() => !isSent && sendRequest(u.id)}
                                         style={{
@@ -173,6 +219,7 @@ const Friends = () => {
                                     >
                                         {isSent ? <><Check size={14} /> Sent</> : <><UserPlus size={14} /> Add</>}
                                     </button>
+                                    )}
                                 </div>
                             );
                         })}
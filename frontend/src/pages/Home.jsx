@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Search, MapPin, Users, ChevronRight, Gamepad2 } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
-import { searchTurfs, api } from '../services/api';
+import { searchTurfs, batchGet, api } from '../services/api';
 
 const Home = () => {
     const [city, setCity] = useState('');
@@ -13,16 +13,19 @@ const Home = () => {
     const navigate = useNavigate();
 
     useEffect(() => {
-        loadTurfs();
-        loadAnnouncements();
+        loadHome();
     }, []);
 
-    const loadAnnouncements = async () => {
+    // First paint needs turfs and announcements; fetch both in one round trip
+    const loadHome = async () => {
         try {
-            const response = await api.get('/announcements');
-            setAnnouncements(response.data);
+            const [turfsRes, announcementsRes] = await batchGet(['/turfs?city=', '/announcements']);
+            if (turfsRes.status === 200) setTurfs(turfsRes.body);
+            if (announcementsRes.status === 200) setAnnouncements(announcementsRes.body);
         } catch (e) {
             console.error(e);
+        } finally {
+            setLoading(false);
         }
     };
 
@@ -18,11 +18,11 @@ const Profile = () => {
     const fetchStats = async () => {
         try {
             const [bookingsData, friendsData] = await Promise.all([
-                getUserBookings(user.id),
+                getUserBookings(user.id, { limit: 1 }),
                 getFriends(user.id)
             ]);
             setStats({
-                matches: bookingsData.length,
+                matches: bookingsData.total,
                 friends: friendsData.length
             });
         } catch (error) {
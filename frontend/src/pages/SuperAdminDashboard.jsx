@@ -21,6 +21,9 @@ const SuperAdminDashboard = () => {
     const [owners, setOwners] = useState([]);
     const [users, setUsers] = useState([]);
     const [turfs, setTurfs] = useState([]);
+    // Keyset cursors from /admin/users and /admin/turfs; null once the last page is in
+    const [usersAfter, setUsersAfter] = useState(null);
+    const [turfsAfter, setTurfsAfter] = useState(null);
 
     // UI State
     const [showAddOwnerModal, setShowAddOwnerModal] = useState(false);
@@ -61,23 +64,45 @@ const SuperAdminDashboard = () => {
     const fetchUsers = async () => {
         setLoading(true);
         try {
-            const data = await getAllUsers();
-            setUsers(data);
+            const data = await getAllUsers({ limit: 500 });
+            setUsers(data.items);
+            setUsersAfter(data.next_after_id);
         } catch (error) {
             console.error("Error fetching users:", error);
         } finally { setLoading(false); }
     };
 
+    const loadMoreUsers = async () => {
+        try {
+            const data = await getAllUsers({ afterId: usersAfter, limit: 500 });
+            setUsers(prev => [...prev, ...data.items]);
+            setUsersAfter(data.next_after_id);
+        } catch (error) {
+            console.error("Error fetching users:", error);
+        }
+    };
+
     const fetchTurfs = async () => {
         setLoading(true);
         try {
-            const data = await getAllTurfsAdmin();
-            setTurfs(data);
+            const data = await getAllTurfsAdmin({ limit: 500 });
+            setTurfs(data.items);
+            setTurfsAfter(data.next_after_id);
         } catch (error) {
             console.error("Error fetching turfs:", error);
         } finally { setLoading(false); }
     };
 
+    const loadMoreTurfs = async () => {
+        try {
+            const data = await getAllTurfsAdmin({ afterId: turfsAfter, limit: 500 });
+            setTurfs(prev => [...prev, ...data.items]);
+            setTurfsAfter(data.next_after_id);
+        } catch (error) {
+            console.error("Error fetching turfs:", error);
+        }
+    };
+
     const handleAddOwner = async (e) => {
         e.preventDefault();
         try {
@@ -228,6 +253,11 @@ const SuperAdminDashboard = () => {
                             </div>
                         ))}
                     </div>
+                    {!loading && turfsAfter && (
+                        <button className="btn-primary-sm" style={{ marginTop: 16 }} onClick={loadMoreTurfs}>
+                            Load more turfs
+                        </button>
+                    )}
                 </div>
             )}
 
@@ -255,6 +285,11 @@ const SuperAdminDashboard = () => {
                             </div>
                         ))}
                     </div>
+                    {!loading && usersAfter && (
+                        <button className="btn-primary-sm" style={{ marginTop: 16 }} onClick={loadMoreUsers}>
+                            Load more users
+                        </button>
+                    )}
                 </div>
             )}
 
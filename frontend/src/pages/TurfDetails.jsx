@@ -54,13 +54,15 @@ const TurfDetails = () => {
 
     const totalPrice = parseFloat(turf.price);
     const sharePerPlayer = numPlayers > 1 ? (totalPrice / numPlayers).toFixed(2) : null;
+    // Largest JPEG variant for the hero; older uploads only have image_url
+    const heroImage = turf.image_srcset ? turf.image_srcset.jpg.split(', ').pop().split(' ')[0] : turf.image_url;
 
     return (
         <div className="animate-fade-in" style={{ paddingBottom: '80px' }}>
             {/* Hero image */}
             <div style={{
                 height: '250px',
-                backgroundImage: turf.image_url ? `url(${turf.image_url})` : 'none',
+                backgroundImage: heroImage ? `url(${heroImage})` : 'none',
                 backgroundSize: 'cover', backgroundPosition: 'center',
                 position: 'relative', backgroundColor: '#c8e6c9'
             }}>
@@ -55,8 +55,15 @@ export const getAdminStats = async () => {
     return response.data;
 };
 
-export const getAllUsers = async () => {
-    const response = await api.get('/admin/users');
+// Daily bookings and revenue per city, for trend charts
+export const getAdminStatsSeries = async (days = 30, city) => {
+    const response = await api.get('/admin/stats/series', { params: { days, city } });
+    return response.data;
+};
+
+// Paged: returns { items, next_after_id }. Pass next_after_id back as afterId for the next page.
+export const getAllUsers = async ({ afterId, limit, role, banned } = {}) => {
+    const response = await api.get('/admin/users', { params: { after_id: afterId, limit, role, banned } });
     return response.data;
 };
 
@@ -65,8 +72,8 @@ export const toggleBanUser = async (id) => {
     return response.data;
 };
 
-export const getAllTurfsAdmin = async () => {
-    const response = await api.get('/admin/turfs');
+export const getAllTurfsAdmin = async ({ afterId, limit, city, status } = {}) => {
+    const response = await api.get('/admin/turfs', { params: { after_id: afterId, limit, city, status } });
     return response.data;
 };
 
@@ -91,6 +98,12 @@ export const searchTurfs = async (city) => {
     }
 };
 
+// Several GET routes in one round trip; resolves to [{status, body}] in the same order
+export const batchGet = async (paths) => {
+    const response = await api.post('/batch', { requests: paths });
+    return response.data.responses;
+};
+
 export const getTurfDetails = async (id) => {
     const response = await api.get(`/turfs/${id}`);
     return response.data;
@@ -101,14 +114,21 @@ export const getTurfSlots = async (id, date) => {
     return response.data;
 };
 
+// Holds a slot for a few minutes during checkout; 409 if someone else has it
+export const holdSlot = async (userId, turfId, date, startTime) => {
+    const response = await api.post('/slots/hold', { user_id: userId, turf_id: turfId, date, start_time: startTime });
+    return response.data;
+};
+
 export const bookTurf = async (bookingData) => {
     const response = await api.post('/book', bookingData);
     return response.data;
 };
 
 // User Data
-export const getUserBookings = async (userId) => {
-    const response = await api.get(`/users/${userId}/bookings`);
+// Paged: returns { items, total, next_cursor }. scope is 'upcoming' or 'completed' (default: both).
+export const getUserBookings = async (userId, { scope, cursor, limit } = {}) => {
+    const response = await api.get(`/users/${userId}/bookings`, { params: { scope, cursor, limit } });
     return response.data;
 };
 
@@ -122,8 +142,15 @@ export const getFriendRequests = async (userId) => {
     return response.data;
 };
 
-export const searchUsers = async (query) => {
-    const response = await api.get(`/users/search?q=${query}`);
+// Paged: returns { items, next_cursor }; each item has friendship: none | friends | request_sent | request_received
+export const searchUsers = async (query, { userId, cursor, limit } = {}) => {
+    const response = await api.get('/users/search', { params: { q: query, user_id: userId, cursor, limit } });
+    return response.data;
+};
+
+// Friends of friends, ranked by mutual friends: [{ id, name, uid, mutual_friends }]
+export const getFriendSuggestions = async (userId, limit = 10) => {
+    const response = await api.get(`/users/${userId}/suggestions`, { params: { limit } });
     return response.data;
 };
 
@@ -138,11 +165,23 @@ export const getMessages = async (userId, friendId) => {
     return response.data;
 };
 
+// Keyset-paged history, newest first. Pass { beforeId } to load older messages.
+export const getMessageHistory = async (userId, friendId, { beforeId, afterId, limit } = {}) => {
+    const response = await api.get('/messages/history', {
+        params: { user_id: userId, friend_id: friendId, before_id: beforeId, after_id: afterId, limit }
+    });
+    return response.data;
+};
+
 export const sendMessage = async (userId, friendId, text) => {
     const response = await api.post('/messages', { user_id: userId, friend_id: friendId, text });
     return response.data;
 };
 
+// Server-sent events: 'message' (new chat message) and 'read' (read receipt).
+// EventSource reconnects on its own and resumes from the last message id.
+export const openChatEvents = (userId) => new EventSource(`${API_URL}/users/${userId}/events`);
+
 // User Profile Public
 export const getUser = async (id) => {
     const response = await api.get(`/users/${id}`);